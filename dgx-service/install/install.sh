@@ -54,8 +54,8 @@ systemctl enable "${SERVICE_NAME}"
 
 # 6. Firewall (if ufw active)
 if command -v ufw &>/dev/null && ufw status | grep -q "Status: active"; then
-  echo "[6/6] Opening UFW ports 22010-22012 …"
-  ufw allow 22010:22012/tcp comment 'DGX-Desktop-Remote'
+  echo "[6/6] Opening UFW ports 22010-22013 …"
+  ufw allow 22010:22013/tcp comment 'DGX-Desktop-Remote'
 else
   echo "[6/6] UFW not active — skipping firewall rule"
 fi
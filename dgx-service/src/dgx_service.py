@@ -36,6 +36,7 @@ def parse_args():
     ap.add_argument("--rpc",     type=int, default=22010, help="RPC port")
     ap.add_argument("--video",   type=int, default=22011, help="Video port")
     ap.add_argument("--input",   type=int, default=22012, help="Input port")
+    ap.add_argument("--push",    type=int, default=22013, help="Push port")
     ap.add_argument("--fps",     type=int, default=60,    help="Target FPS")
     ap.add_argument("--quality", type=int, default=95,    help="JPEG quality (40-100)")
     ap.add_argument("--no-gui",  action="store_true",     help="Run headless (no tray)")
@@ -50,6 +51,7 @@ def main():
         rpc_port   = args.rpc,
         video_port = args.video,
         input_port = args.input,
+        push_port  = args.push,
         fps        = args.fps,
         quality    = args.quality,
     )
@@ -611,6 +611,7 @@ class ManagerWindow(QDialog):
             f"RPC {self._svc.rpc_port}  ·  "
             f"Video {self._svc.video_port}  ·  "
             f"Input {self._svc.input_port}  ·  "
+            f"Push {self._svc.push_port}  ·  "
             f"Discovery {22000}"
         )
 
@@ -280,16 +280,21 @@ class RPCHandler:
         """Return all files in ~/SharedDrive/."""
         SHARED_DRIVE.mkdir(parents=True, exist_ok=True)
         files = []
-        for f in sorted(SHARED_DRIVE.iterdir()):
-            if f.is_file():
-                sz   = f.stat().st_size
-                mtime= f.stat().st_mtime
-                files.append({
-                    "name":       f.name,
-                    "size":       sz,
-                    "size_human": _human_size(sz),
-                    "mtime":      mtime,
-                })
+        # scandir yields the type from the directory read itself; one stat
+        # per regular file supplies both size and mtime.
+        with os.scandir(SHARED_DRIVE) as it:
+            entries = sorted((e for e in it if e.is_file()), key=lambda e: e.name)
+        for e in entries:
+            try:
+                st = e.stat()
+            except OSError:
+                continue    # removed between the scan and the stat
+            files.append({
+                "name":       e.name,
+                "size":       st.st_size,
+                "size_human": _human_size(st.st_size),
+                "mtime":      st.st_mtime,
+            })
         return {"ok": True, "files": files, "path": str(SHARED_DRIVE)}
 
     def handle_delete_shared(self, msg: dict) -> dict:
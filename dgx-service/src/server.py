@@ -48,6 +48,7 @@ BRIDGE_STAGING.mkdir(parents=True, exist_ok=True)
 SHARED_DRIVE.mkdir(parents=True, exist_ok=True)
 
 CHUNK = 65536
+HEARTBEAT_INTERVAL = 2.0   # seconds between push-channel heartbeats
 
 
 def _send_json(conn: socket.socket, obj: dict):
@@ -55,6 +56,12 @@ def _send_json(conn: socket.socket, obj: dict):
     conn.sendall(data)
 
 
+def _send_framed(conn: socket.socket, obj: dict):
+    """Send obj as a 4-byte big-endian length + JSON body."""
+    body = json.dumps(obj).encode()
+    conn.sendall(len(body).to_bytes(4, "big") + body)
+
+
 def _recv_line(conn: socket.socket, maxlen: int = 131072) -> str:
     buf = bytearray()
     while True:
@@ -79,6 +86,13 @@ def _recv_exact(conn: socket.socket, n: int) -> bytes:
     return bytes(buf)
 
 
+def _close_quietly(conn: socket.socket):
+    try:
+        conn.close()
+    except OSError:
+        pass
+
+
 # ──────────────────────────────────────────────────────────────────────
 # Session — one PC client
 # ──────────────────────────────────────────────────────────────────────
@@ -89,22 +103,24 @@ class ClientSession:
         self._rpc_conn  = rpc_conn
         self._vid_conn: Optional[socket.socket] = None
         self._inp_conn: Optional[socket.socket] = None
+        self._push_conn: Optional[socket.socket] = None
         self._running   = False
         self._lock      = threading.Lock()
         self._rpc_push_lock = threading.Lock()  # guards all writes to _rpc_conn
+        self._push_lock = threading.Lock()      # guards all writes to _push_conn
+        # Set from the hello: PC reads pushes on a dedicated channel
+        self._push_channel = False
+        self._push_ready   = threading.Event()
+        self._rtt_ms: Optional[float] = None    # from the latest heartbeat_ack
 
     def set_video_conn(self, conn: socket.socket):
         """Accept the video channel socket and drain the start_stream handshake."""
         self._vid_conn = conn
-        # Drain the PC's opening start_stream message (no response needed)
+        # Drain the PC's opening start_stream message (no response needed).
+        # Read exactly one line — anything after it is already real traffic.
         try:
             conn.settimeout(3)
-            buf = b""
-            while b"\n" not in buf:
-                chunk = conn.recv(4096)
-                if not chunk:
-                    break
-                buf += chunk
+            _recv_line(conn)
             conn.settimeout(None)
         except Exception:
             pass
@@ -112,20 +128,44 @@ class ClientSession:
     def set_input_conn(self, conn: socket.socket):
         """Accept the input channel socket, drain start_input, then start loop."""
         self._inp_conn = conn
-        # Drain the PC's opening start_input message (no response needed)
+        # Drain the PC's opening start_input message (no response needed).
+        # Read exactly one line — anything after it is already real traffic.
         try:
             conn.settimeout(3)
-            buf = b""
-            while b"\n" not in buf:
-                chunk = conn.recv(4096)
-                if not chunk:
-                    break
-                buf += chunk
+            _recv_line(conn)
             conn.settimeout(None)
         except Exception:
             pass
         threading.Thread(target=self._input_loop, daemon=True).start()
 
+    def set_push_conn(self, conn: socket.socket):
+        """Attach a push channel socket whose start_push was already drained."""
+        self._push_conn = conn
+        self._push_ready.set()
+
+    def wants_push_conn(self) -> bool:
+        """True while this session announced a push channel and has none yet."""
+        return self._running and self._push_channel and not self._push_ready.is_set()
+
+    def push(self, msg: dict) -> bool:
+        """
+        Send an unsolicited message to the PC.
+        Goes out on the push channel when the PC opened one; older clients
+        read pushes interleaved on the RPC socket instead.
+        """
+        data = (json.dumps(msg) + "\n").encode()
+        if self._push_channel:
+            # The push socket may still be in the accept queue right after hello
+            if not self._push_ready.wait(3):
+                log.warning("Push channel not ready — dropped %s", msg.get("type"))
+                return False
+            with self._push_lock:
+                self._push_conn.sendall(data)
+        else:
+            with self._rpc_push_lock:
+                self._rpc_conn.sendall(data)
+        return True
+
     def run(self):
         """Block on RPC control channel until client disconnects."""
         self._running = True
@@ -150,6 +190,16 @@ class ClientSession:
 
         # Delegate to rpc_handler so the response includes the full
         # 'display' sub-dict, gpus, disk_free_gb, etc. that the PC expects.
+        # The PC opens its push socket before the hello, so it is usually
+        # parked on the service already; claim it under the session lock so
+        # a late arrival in _accept_push sees _push_channel set.
+        with self._svc._session_lock:
+            self._push_channel = bool(hello.get("push_channel"))
+            pending, self._svc._pending_push = self._svc._pending_push, None
+            if pending and self._push_channel:
+                self.set_push_conn(pending)
+        if pending and not self._push_channel:
+            _close_quietly(pending)
         hello_resp = self._svc.rpc.handle_hello(hello)
         _send_json(self._rpc_conn, hello_resp)
         log.info("Handshake complete with PC (agent=%s)", hello.get("agent", "?"))
@@ -158,6 +208,8 @@ class ClientSession:
         self._svc.capture.start(self._on_frame)
         # Start cursor push thread
         threading.Thread(target=self._cursor_push_loop, daemon=True).start()
+        if self._push_channel:
+            threading.Thread(target=self._heartbeat_loop, daemon=True).start()
         try:
             while self._running:
                 line = _recv_line(self._rpc_conn)
@@ -193,8 +245,9 @@ class ClientSession:
         Polls the X11 cursor shape every 150ms and pushes a cursor_shape
         message to the PC when it changes.  Uses python-xlib if available,
         falls back to xdotool subprocess.
-        Push messages are sent on the RPC socket between request/response
-        pairs — they are NOT responses to a request, so we use _rpc_push_lock.
+        Push messages are NOT responses to a request, so they go through
+        push() — the dedicated push channel, or the RPC socket under
+        _rpc_push_lock for older clients.
         """
 
         def _get_cursor_name() -> str:
@@ -229,24 +282,36 @@ class ClientSession:
                 shape = _get_cursor_name()
                 if shape and shape != self._last_cursor_shape:
                     self._last_cursor_shape = shape
-                    msg = (
-                        __import__("json").dumps(
-                            {"type": "cursor_shape", "shape": shape}
-                        ) + "\n"
-                    ).encode()
-                    with self._rpc_push_lock:
-                        try:
-                            self._rpc_conn.sendall(msg)
-                        except OSError:
-                            break
+                    try:
+                        self.push({"type": "cursor_shape", "shape": shape})
+                    except OSError:
+                        break
             except Exception as e:
                 log.debug("Cursor push error: %s", e)
             time.sleep(0.15)
 
+    def _heartbeat_loop(self):
+        """
+        Pushes a timestamped heartbeat every HEARTBEAT_INTERVAL.  The PC
+        echoes the timestamp back on the input channel; the round-trip
+        measured in _input_loop rides along in the next heartbeat so the PC
+        can show ping without issuing RPCs.
+        """
+        while self._running:
+            try:
+                self.push({"type": "heartbeat", "ts": time.monotonic(),
+                           "rtt_ms": self._rtt_ms})
+            except OSError:
+                break
+            time.sleep(HEARTBEAT_INTERVAL)
+
     def _cleanup(self):
         self._running = False
+        with self._svc._session_lock:
+            if self._svc._session is self:
+                self._svc._session = None
         self._svc.capture.stop()
-        for c in (self._rpc_conn, self._vid_conn, self._inp_conn):
+        for c in (self._rpc_conn, self._vid_conn, self._inp_conn, self._push_conn):
             if c:
                 try:
                     c.close()
@@ -296,6 +361,8 @@ class ClientSession:
                 ih.key_press(msg.get("key", ""), msg.get("modifiers", []))
             elif t == "key_release":
                 ih.key_release(msg.get("key", ""), msg.get("modifiers", []))
+            elif t == "heartbeat_ack":
+                self._rtt_ms = (time.monotonic() - msg.get("ts", 0.0)) * 1000
 
     # ------------------------------------------------------------------
     # File receive (upload PC → DGX)
@@ -394,6 +461,7 @@ class DGXService:
         rpc_port:    int  = 22010,
         video_port:  int  = 22011,
         input_port:  int  = 22012,
+        push_port:   int  = 22013,
         fps:         int  = 60,
         quality:     int  = 95,
     ):
@@ -401,6 +469,7 @@ class DGXService:
         self.rpc_port    = rpc_port
         self.video_port  = video_port
         self.input_port  = input_port
+        self.push_port   = push_port
 
         self.capture           = ScreenCapture(fps=fps, quality=quality)
         self.input_handler     = InputHandler()
@@ -411,6 +480,7 @@ class DGXService:
         self._session: Optional[ClientSession] = None
         self._pending_vid: Optional[socket.socket] = None
         self._pending_inp: Optional[socket.socket] = None
+        self._pending_push: Optional[socket.socket] = None
         self._session_lock = threading.Lock()
 
     def push_file_to_pc(
@@ -429,18 +499,15 @@ class DGXService:
             sess = self._session
         if not sess or not sess._running:
             return False
-        msg = (json.dumps({
-            "type":     "file_available",
-            "filename": filename,
-            "size":     size,
-            "folder":   "SharedDrive",
-            "is_dir":   bool(is_dir),
-            "root_name": (root_name or filename),
-        }) + "\n").encode()
         try:
-            with sess._rpc_push_lock:
-                sess._rpc_conn.sendall(msg)
-            return True
+            return sess.push({
+                "type":     "file_available",
+                "filename": filename,
+                "size":     size,
+                "folder":   "SharedDrive",
+                "is_dir":   bool(is_dir),
+                "root_name": (root_name or filename),
+            })
         except Exception as e:
             log.warning("push_file_to_pc failed: %s", e)
             return False
@@ -463,14 +530,16 @@ class DGXService:
             ("rpc",   self.rpc_port,   self._accept_rpc),
             ("video", self.video_port, self._accept_video),
             ("input", self.input_port, self._accept_input),
+            ("push",  self.push_port,  self._accept_push),
         ]:
             t = threading.Thread(
                 target=handler, args=(port,), daemon=True, name=f"Listener-{tag}"
             )
             t.start()
         log.info(
-            "DGX service started — Discovery:%d  RPC:%d  Video:%d  Input:%d",
+            "DGX service started — Discovery:%d  RPC:%d  Video:%d  Input:%d  Push:%d",
             DISCOVERY_PORT, self.rpc_port, self.video_port, self.input_port,
+            self.push_port,
         )
 
     def stop(self):
@@ -518,34 +587,34 @@ class DGXService:
         """
         try:
             conn.settimeout(8)
-            buf = b""
-            while b"\n" not in buf:
-                chunk = conn.recv(4096)
-                if not chunk:
-                    return
-                buf += chunk
-            msg = json.loads(buf.split(b"\n")[0].decode())
+            msg = json.loads(_recv_line(conn))
+            # Newer PCs ask for a length-prefixed reply; older ones read a line
+            reply = _send_framed if msg.get("framing") == "length" else _send_json
             if msg.get("type") != "negotiate":
-                _send_json(conn, {"ok": False, "error": "expected negotiate"})
+                reply(conn, {"ok": False, "error": "expected negotiate"})
                 return
 
             # Reject if a session is already running
             with self._session_lock:
                 if self._session and self._session._running:
-                    _send_json(conn, {"ok": False, "error": "session already active"})
+                    reply(conn, {"ok": False, "error": "session already active"})
                     log.info("Rejected negotiation from %s — session already active", addr)
                     return
 
             # Tell the PC to use the ports we're already listening on.
             # No new listeners are spawned — no port exhaustion.
-            _send_json(conn, {
-                "ok":    True,
-                "rpc":   self.rpc_port,
-                "video": self.video_port,
-                "input": self.input_port,
+            # The listeners were bound in start(), so the RPC port is
+            # already accepting — the PC needs no separate ping to check.
+            reply(conn, {
+                "ok":        True,
+                "rpc":       self.rpc_port,
+                "video":     self.video_port,
+                "input":     self.input_port,
+                "push":      self.push_port,
+                "rpc_ready": True,
             })
-            log.info("Negotiated ports — RPC:%d  Video:%d  Input:%d",
-                     self.rpc_port, self.video_port, self.input_port)
+            log.info("Negotiated ports — RPC:%d  Video:%d  Input:%d  Push:%d",
+                     self.rpc_port, self.video_port, self.input_port, self.push_port)
 
         except Exception as e:
             log.exception("Error during negotiation: %s", e)
@@ -599,6 +668,33 @@ class DGXService:
                 except OSError:
                     break
 
+    def _accept_push(self, port: int):
+        srv = self._make_server(port)
+        with srv:
+            while self._running:
+                try:
+                    conn, addr = srv.accept()
+                    log.info("Push connection from %s", addr)
+                    # Drain start_push before taking the lock
+                    try:
+                        conn.settimeout(3)
+                        _recv_line(conn)
+                        conn.settimeout(None)
+                    except Exception:
+                        pass
+                    # Attach only to a live session that announced a push
+                    # channel; otherwise park it until the next hello claims it.
+                    with self._session_lock:
+                        sess = self._session
+                        if sess and sess.wants_push_conn():
+                            sess.set_push_conn(conn)
+                        else:
+                            if self._pending_push:
+                                _close_quietly(self._pending_push)
+                            self._pending_push = conn
+                except OSError:
+                    break
+
     def _start_session(self, rpc_conn: socket.socket):
         sess = ClientSession(self, rpc_conn)
         with self._session_lock:
@@ -621,9 +717,10 @@ class DGXService:
 
     def _on_resolution_change(self, w: int, h: int):
         log.info("Resolution changed to %dx%d", w, h)
-        if self._session and self._session._running:
+        sess = self._session
+        if sess and sess._running:
             try:
-                _send_json(self._session._rpc_conn, {
+                sess.push({
                     "type": "resolution_changed",
                     "width": w, "height": h,
                 })
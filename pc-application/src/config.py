@@ -21,6 +21,7 @@ class Config:
     rpc_port:       int  = 22010
     video_port:     int  = 22011
     input_port:     int  = 22012
+    push_port:      int  = 22013
     pc_listen_port: int  = 12010
 
     # Display
@@ -52,6 +53,7 @@ class Config:
     last_rpc_port:    int  = 22010
     last_video_port:  int  = 22011
     last_input_port:  int  = 22012
+    last_push_port:   int  = 22013
 
     def is_configured(self) -> bool:
         return CONFIG_FILE.exists() and bool(self.pc_ip) and bool(self.dgx_ip)
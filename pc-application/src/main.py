@@ -24,8 +24,7 @@ from PyQt6.QtCore    import Qt, QSettings
 from PyQt6.QtGui     import QFont
 
 from config        import Config
-from theme         import APP_STYLESHEET
-from setup_wizard  import SetupWizard
+from theme         import get_stylesheet
 
 
 def main():
@@ -36,7 +35,7 @@ def main():
     app.setApplicationName("DGX Desktop Remote")
     app.setApplicationVersion("1.0.0")
     app.setOrganizationName("FathomPC")
-    app.setStyleSheet(APP_STYLESHEET)
+    app.setStyleSheet(get_stylesheet())
 
     # Install global crash handler — must come before any other initialisation
     from crash_catcher import install_crash_handler
@@ -50,7 +49,9 @@ def main():
     config = Config.load()
 
     # Run setup wizard on first launch
+    # (imported only when needed — configured launches never load it)
     if not config.is_configured():
+        from setup_wizard import SetupWizard
         wizard = SetupWizard(config)
         if wizard.exec() != SetupWizard.DialogCode.Accepted:
             # User exited wizard without completing
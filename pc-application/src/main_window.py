@@ -37,7 +37,8 @@ class _ConnectWorker(QThread):
     failure = pyqtSignal(str)
 
     def __init__(self, connection: DGXConnection, config: Config,
-                 rpc_port: int = 0, video_port: int = 0, input_port: int = 0):
+                 rpc_port: int = 0, video_port: int = 0, input_port: int = 0,
+                 push_port: int = 0):
         super().__init__()
         self._conn   = connection
         self._config = config
@@ -45,6 +46,7 @@ class _ConnectWorker(QThread):
         self._rpc_port   = rpc_port   or config.rpc_port
         self._video_port = video_port or config.video_port
         self._input_port = input_port or config.input_port
+        self._push_port  = push_port  or config.push_port
 
     def run(self):
         try:
@@ -52,7 +54,8 @@ class _ConnectWorker(QThread):
                 dgx_ip     = self._config.dgx_ip,
                 rpc_port   = self._rpc_port,
                 video_port = self._video_port,
-                input_port = self._input_port
+                input_port = self._input_port,
+                push_port  = self._push_port
             )
             self.success.emit(info)
         except Exception as e:
@@ -84,13 +87,16 @@ class _NegotiateConnectWorker(QThread):
                 rpc_port   = ports["rpc"]
                 video_port = ports["video"]
                 input_port = ports["input"]
+                push_port  = ports["push"]
                 # Persist negotiated ports
                 self._config.rpc_port        = rpc_port
                 self._config.video_port      = video_port
                 self._config.input_port      = input_port
+                self._config.push_port       = push_port
                 self._config.last_rpc_port   = rpc_port
                 self._config.last_video_port = video_port
                 self._config.last_input_port = input_port
+                self._config.last_push_port  = push_port
                 self._config.save()
                 self.progress.emit(
                     f"Ports agreed  RPC={rpc_port}  Video={video_port}  Input={input_port}"
@@ -100,6 +106,7 @@ class _NegotiateConnectWorker(QThread):
                 rpc_port   = self._config.last_rpc_port   or self._config.rpc_port
                 video_port = self._config.last_video_port or self._config.video_port
                 input_port = self._config.last_input_port or self._config.input_port
+                push_port  = self._config.last_push_port  or self._config.push_port
                 self.progress.emit(
                     f"Negotiation failed – using saved ports {rpc_port}/{video_port}/{input_port}"
                 )
@@ -110,7 +117,8 @@ class _NegotiateConnectWorker(QThread):
                 dgx_ip     = self._config.dgx_ip,
                 rpc_port   = rpc_port,
                 video_port = video_port,
-                input_port = input_port
+                input_port = input_port,
+                push_port  = push_port
             )
             self.success.emit(info)
         except Exception as e:
@@ -763,7 +771,7 @@ class MainWindow(QMainWindow):
 
     def _open_manager(self):
         from manager_window import ManagerWindow
-        dlg = ManagerWindow(self.config, self)
+        dlg = ManagerWindow(self.config, self, connection=self.conn)
         dlg.exec()
 
     # ------------------------------------------------------------------
@@ -5,18 +5,21 @@ PC Manager dialog — settings, tools, DGX system info.
 
 import subprocess
 import platform
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Optional
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGridLayout,
     QLabel, QLineEdit, QSpinBox, QComboBox, QPushButton,
-    QGroupBox, QCheckBox, QTabWidget, QWidget, QTextEdit,
+    QGroupBox, QCheckBox, QTabWidget, QWidget,
     QDialogButtonBox, QMessageBox, QFrame, QSizePolicy
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont
 
 from config import Config
+from network.connection import DGXConnection
 from theme import (
     ACCENT, SUCCESS, ERROR, WARNING, TEXT_DIM, TEXT_MAIN,
     BG_RAISED, BG_SURFACE, BORDER, BG_BASE
@@ -24,6 +27,55 @@ from theme import (
 from widgets import HDivider, SectionTitle, InfoCard
 
 
+FW_CMD_TEXT = (
+    "New-NetFirewallRule `\n"
+    "  -DisplayName 'DGX-Desktop-Remote' `\n"
+    "  -Direction Inbound -Protocol TCP `\n"
+    "  -LocalPort 12010 -RemoteAddress 10.0.0.1 `\n"
+    "  -Action Allow"
+)
+
+# Config attributes the dialog can edit — diffed on Save to skip no-op writes
+_EDITABLE_FIELDS = (
+    "pc_ip", "dgx_ip", "rpc_port", "video_port", "input_port",
+    "display_mode", "target_fps", "jpeg_quality", "virt_side",
+    "auto_connect", "start_minimized", "show_fps", "show_ping",
+    "confirm_file_del", "cursor_mode",
+)
+
+# Stylesheets are built from constant theme colours, so format them once at
+# import rather than on every dialog open.
+_HEADER_QSS          = f"background: {BG_RAISED}; border-bottom: 1px solid {BORDER};"
+_TITLE_QSS           = f"font-size: 16px; font-weight: 700; color: {TEXT_MAIN};"
+_BADGE_CONNECTED_QSS = f"color: {SUCCESS}; font-size: 12px; font-weight: 600;"
+_BADGE_OFFLINE_QSS   = f"color: {TEXT_DIM}; font-size: 12px; font-weight: 600;"
+_TABS_QSS            = "QTabWidget::pane { border: none; }"
+_BTN_ROW_QSS         = f"background: {BG_RAISED};"
+_NOTE_QSS            = f"color: {TEXT_DIM}; font-size: 11px;"
+_FW_CMD_QSS = (
+    f"background: {BG_SURFACE}; border: 1px solid {BORDER}; border-radius: 6px;"
+    f"padding: 6px; color: {TEXT_MAIN}; font-size: 12px;"
+    f"font-family: 'Cascadia Code', 'Consolas', monospace;"
+)
+_GPU_BOX_QSS = (
+    f"background: {BG_SURFACE}; border: 1px solid {BORDER}; border-radius: 6px;"
+    f"padding: 8px; color: {TEXT_MAIN}; font-size: 12px;"
+    f"font-family: 'Cascadia Code', 'Consolas', monospace;"
+)
+
+
+@contextmanager
+def _signals_blocked(*widgets):
+    """Suppress change signals while widgets are filled in programmatically."""
+    for w in widgets:
+        w.blockSignals(True)
+    try:
+        yield
+    finally:
+        for w in widgets:
+            w.blockSignals(False)
+
+
 # ──────────────────────────────────────────────────────────────────────
 # System info fetch thread
 # ──────────────────────────────────────────────────────────────────────
@@ -31,12 +83,12 @@ from widgets import HDivider, SectionTitle, InfoCard
 class _SystemInfoThread(QThread):
     result = pyqtSignal(dict)
 
-    def __init__(self, connection):
+    def __init__(self, connection: Optional[DGXConnection]):
         super().__init__()
         self._conn = connection
 
     def run(self):
-        if not self._conn or not self._conn.connected:
+        if not (self._conn and self._conn.connected):
             self.result.emit({})
             return
         try:
@@ -52,13 +104,15 @@ class _SystemInfoThread(QThread):
 
 class ManagerWindow(QDialog):
 
-    def __init__(self, config: Config, parent=None):
+    def __init__(self, config: Config, parent=None,
+                 connection: Optional[DGXConnection] = None):
         super().__init__(parent)
         self.config = config
-        self._conn  = parent.conn if parent and hasattr(parent, "conn") else None
+        self._conn  = connection
         self.setWindowTitle("DGX Desktop Remote — Manager")
         self.setMinimumSize(560, 560)
         self.setModal(True)
+        self._built_tabs: set[str] = set()
         self._build_ui()
         self._populate()
 
@@ -70,41 +124,41 @@ class ManagerWindow(QDialog):
         # Header bar
         header = QWidget()
         header.setFixedHeight(52)
-        header.setStyleSheet(
-            f"background: {BG_RAISED}; border-bottom: 1px solid {BORDER};"
-        )
+        header.setStyleSheet(_HEADER_QSS)
         hl = QHBoxLayout(header)
         hl.setContentsMargins(16, 0, 16, 0)
         title = QLabel("Manager")
-        title.setStyleSheet(
-            f"font-size: 16px; font-weight: 700; color: {TEXT_MAIN};"
-        )
+        title.setStyleSheet(_TITLE_QSS)
         hl.addWidget(title)
         hl.addStretch()
-        conn_badge = QLabel(
-            "● Connected" if (self._conn and self._conn.connected) else "● Offline"
-        )
-        conn_badge.setStyleSheet(
-            f"color: {SUCCESS if (self._conn and self._conn.connected) else TEXT_DIM};"
-            f"font-size: 12px; font-weight: 600;"
-        )
-        hl.addWidget(conn_badge)
+        self._conn_badge = QLabel()
+        self._update_conn_badge()
+        hl.addWidget(self._conn_badge)
         root.addWidget(header)
 
         # Tabs
         tabs = QTabWidget()
-        tabs.setStyleSheet(f"QTabWidget::pane {{ border: none; }}")
+        tabs.setStyleSheet(_TABS_QSS)
         tabs.addTab(self._tab_network(),   "🌐  Network")
-        tabs.addTab(self._tab_display(),   "🖥  Display")
-        tabs.addTab(self._tab_behavior(),  "⚙  Behavior")
-        tabs.addTab(self._tab_dgxinfo(),   "📊  DGX Info")
-        tabs.addTab(self._tab_tools(),     "🔧  Tools")
+        self._built_tabs.add("network")
+        # Remaining tabs are built (and populated) on first visit
+        self._lazy_tabs = {}
+        for name, label in (
+            ("display",  "🖥  Display"),
+            ("behavior", "⚙  Behavior"),
+            ("dgxinfo",  "📊  DGX Info"),
+            ("tools",    "🔧  Tools"),
+        ):
+            holder = QWidget()
+            QVBoxLayout(holder).setContentsMargins(0, 0, 0, 0)
+            self._lazy_tabs[tabs.addTab(holder, label)] = (name, holder)
+        tabs.currentChanged.connect(self._on_tab_changed)
         root.addWidget(tabs)
 
         # Save / Cancel
         root.addWidget(HDivider())
         btn_row = QWidget()
-        btn_row.setStyleSheet(f"background: {BG_RAISED};")
+        btn_row.setStyleSheet(_BTN_ROW_QSS)
         bl = QHBoxLayout(btn_row)
         bl.setContentsMargins(16, 10, 16, 10)
         bl.addStretch()
@@ -119,6 +173,20 @@ class ManagerWindow(QDialog):
         bl.addWidget(btn_save)
         root.addWidget(btn_row)
 
+    def _on_tab_changed(self, index: int):
+        entry = self._lazy_tabs.pop(index, None)
+        if entry is None:
+            return
+        name, holder = entry
+        holder.layout().addWidget(getattr(self, f"_tab_{name}")())
+        self._built_tabs.add(name)
+        populate = getattr(self, f"_populate_{name}", None)
+        if populate:
+            populate()
+        # First visit to DGX Info is what triggers the initial fetch
+        if name == "dgxinfo" and self._is_connected():
+            self._fetch_dgx_info()
+
     # ------------------------------------------------------------------
     # Tabs
     # ------------------------------------------------------------------
@@ -155,7 +223,7 @@ class ManagerWindow(QDialog):
             "Default ports: 22010 (RPC), 22011 (Video), 22012 (Input)\n"
             "Changes take effect on next connection."
         )
-        note.setStyleSheet(f"color: {TEXT_DIM}; font-size: 11px;")
+        note.setStyleSheet(_NOTE_QSS)
         l.addWidget(note)
         l.addStretch()
         return w
@@ -190,7 +258,7 @@ class ManagerWindow(QDialog):
             "Virtual Display Mode: DGX appears as an additional monitor.\n"
             "Restart required after mode change."
         )
-        mode_note.setStyleSheet(f"color: {TEXT_DIM}; font-size: 11px;")
+        mode_note.setStyleSheet(_NOTE_QSS)
         mode_note.setWordWrap(True)
         l.addWidget(mode_note)
 
@@ -235,7 +303,7 @@ class ManagerWindow(QDialog):
             "Hidden: hides the cursor while inside the canvas.\n"
             "Arrow: always show a plain arrow inside the canvas."
         )
-        cursor_note.setStyleSheet(f"color: {TEXT_DIM}; font-size: 11px;")
+        cursor_note.setStyleSheet(_NOTE_QSS)
         cursor_note.setWordWrap(True)
         l.addWidget(cursor_note)
         self._f_cursor = QComboBox()
@@ -265,11 +333,8 @@ class ManagerWindow(QDialog):
         l.addWidget(SectionTitle("GPUs"))
         self._lbl_gpu = QLabel("—")
         self._lbl_gpu.setWordWrap(True)
-        self._lbl_gpu.setStyleSheet(
-            f"background: {BG_SURFACE}; border: 1px solid {BORDER}; border-radius: 6px;"
-            f"padding: 8px; color: {TEXT_MAIN}; font-size: 12px;"
-            f"font-family: 'Cascadia Code', 'Consolas', monospace;"
-        )
+        self._lbl_gpu.setStyleSheet(_GPU_BOX_QSS)
+        self._last_gpu_text = None
         l.addWidget(self._lbl_gpu)
 
         btn_refresh = QPushButton("  Refresh")
@@ -278,10 +343,6 @@ class ManagerWindow(QDialog):
         l.addWidget(btn_refresh)
 
         l.addStretch()
-
-        if self._conn and self._conn.connected:
-            QTimer.singleShot(300, self._fetch_dgx_info)
-
         return w
 
     def _tab_tools(self):
@@ -299,24 +360,16 @@ class ManagerWindow(QDialog):
         fw_label = QLabel(
             "Run in PowerShell as Administrator:"
         )
-        fw_label.setStyleSheet(f"color: {TEXT_DIM}; font-size: 11px;")
+        fw_label.setStyleSheet(_NOTE_QSS)
         l.addWidget(fw_label)
-        fw_cmd = QTextEdit()
-        fw_cmd.setReadOnly(True)
-        fw_cmd.setFixedHeight(80)
-        fw_cmd.setPlainText(
-            "New-NetFirewallRule `\n"
-            "  -DisplayName 'DGX-Desktop-Remote' `\n"
-            "  -Direction Inbound -Protocol TCP `\n"
-            "  -LocalPort 12010 -RemoteAddress 10.0.0.1 `\n"
-            "  -Action Allow"
-        )
+        fw_cmd = QLabel(FW_CMD_TEXT)
+        fw_cmd.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        fw_cmd.setWordWrap(False)
+        fw_cmd.setStyleSheet(_FW_CMD_QSS)
         l.addWidget(fw_cmd)
         btn_copy = QPushButton("  Copy Command")
         btn_copy.setFixedWidth(140)
-        btn_copy.clicked.connect(
-            lambda: QApplication_clipboard(fw_cmd.toPlainText())
-        )
+        btn_copy.clicked.connect(lambda: QApplication_clipboard(FW_CMD_TEXT))
         l.addWidget(btn_copy)
 
         l.addWidget(SectionTitle("Reset"))
@@ -333,49 +386,74 @@ class ManagerWindow(QDialog):
     # ------------------------------------------------------------------
 
     def _populate(self):
+        """Fill every tab that has been built so far from the config."""
+        for name in ("network", "display", "behavior"):
+            if name in self._built_tabs:
+                getattr(self, f"_populate_{name}")()
+
+    def _populate_network(self):
+        c = self.config
+        with _signals_blocked(self._f_pc, self._f_dgx, self._f_rpc,
+                              self._f_video, self._f_input):
+            self._f_pc.setText(c.pc_ip)
+            self._f_dgx.setText(c.dgx_ip)
+            self._f_rpc.setValue(c.rpc_port)
+            self._f_video.setValue(c.video_port)
+            self._f_input.setValue(c.input_port)
+
+    def _populate_display(self):
+        c = self.config
+        with _signals_blocked(self._f_mode, self._f_fps, self._f_quality,
+                              self._f_virt_side):
+            self._f_mode.setCurrentIndex(0 if c.display_mode == "window" else 1)
+            self._f_fps.setValue(c.target_fps)
+            self._f_quality.setValue(c.jpeg_quality)
+            side_map = {"right": 0, "left": 1, "top": 2, "bottom": 3}
+            self._f_virt_side.setCurrentIndex(side_map.get(c.virt_side, 0))
+
+    def _populate_behavior(self):
         c = self.config
-        self._f_pc.setText(c.pc_ip)
-        self._f_dgx.setText(c.dgx_ip)
-        self._f_rpc.setValue(c.rpc_port)
-        self._f_video.setValue(c.video_port)
-        self._f_input.setValue(c.input_port)
-        self._f_mode.setCurrentIndex(0 if c.display_mode == "window" else 1)
-        self._f_fps.setValue(c.target_fps)
-        self._f_quality.setValue(c.jpeg_quality)
-        side_map = {"right": 0, "left": 1, "top": 2, "bottom": 3}
-        self._f_virt_side.setCurrentIndex(side_map.get(c.virt_side, 0))
-        self._cb_autoconnect.setChecked(c.auto_connect)
-        self._cb_startmin.setChecked(c.start_minimized)
-        self._cb_fps.setChecked(c.show_fps)
-        self._cb_ping.setChecked(c.show_ping)
-        self._cb_confirm_del.setChecked(c.confirm_file_del)
-        cursor_map = {"bridge": 0, "hidden": 1, "arrow": 2}
-        self._f_cursor.setCurrentIndex(cursor_map.get(c.cursor_mode, 0))
+        with _signals_blocked(self._cb_autoconnect, self._cb_startmin,
+                              self._cb_fps, self._cb_ping,
+                              self._cb_confirm_del, self._f_cursor):
+            self._cb_autoconnect.setChecked(c.auto_connect)
+            self._cb_startmin.setChecked(c.start_minimized)
+            self._cb_fps.setChecked(c.show_fps)
+            self._cb_ping.setChecked(c.show_ping)
+            self._cb_confirm_del.setChecked(c.confirm_file_del)
+            cursor_map = {"bridge": 0, "hidden": 1, "arrow": 2}
+            self._f_cursor.setCurrentIndex(cursor_map.get(c.cursor_mode, 0))
 
     def _save(self):
         c = self.config
-        old_mode = c.display_mode
+        old = {k: getattr(c, k) for k in _EDITABLE_FIELDS}
 
         c.pc_ip        = self._f_pc.text().strip()
         c.dgx_ip       = self._f_dgx.text().strip()
         c.rpc_port     = self._f_rpc.value()
         c.video_port   = self._f_video.value()
         c.input_port   = self._f_input.value()
-        c.display_mode = "window" if self._f_mode.currentIndex() == 0 else "virtual_display"
-        c.target_fps   = self._f_fps.value()
-        c.jpeg_quality = self._f_quality.value()
-        sides = ["right", "left", "top", "bottom"]
-        c.virt_side    = sides[self._f_virt_side.currentIndex()]
-        c.auto_connect    = self._cb_autoconnect.isChecked()
-        c.start_minimized = self._cb_startmin.isChecked()
-        c.show_fps        = self._cb_fps.isChecked()
-        c.show_ping       = self._cb_ping.isChecked()
-        c.confirm_file_del= self._cb_confirm_del.isChecked()
-        cursor_modes = ["bridge", "hidden", "arrow"]
-        c.cursor_mode = cursor_modes[self._f_cursor.currentIndex()]
-        c.save()
-
-        if old_mode != c.display_mode:
+        # Tabs that were never opened have no widgets; keep their config values
+        if "display" in self._built_tabs:
+            c.display_mode = "window" if self._f_mode.currentIndex() == 0 else "virtual_display"
+            c.target_fps   = self._f_fps.value()
+            c.jpeg_quality = self._f_quality.value()
+            sides = ["right", "left", "top", "bottom"]
+            c.virt_side    = sides[self._f_virt_side.currentIndex()]
+        if "behavior" in self._built_tabs:
+            c.auto_connect    = self._cb_autoconnect.isChecked()
+            c.start_minimized = self._cb_startmin.isChecked()
+            c.show_fps        = self._cb_fps.isChecked()
+            c.show_ping       = self._cb_ping.isChecked()
+            c.confirm_file_del= self._cb_confirm_del.isChecked()
+            cursor_modes = ["bridge", "hidden", "arrow"]
+            c.cursor_mode = cursor_modes[self._f_cursor.currentIndex()]
+
+        changed = {k for k in _EDITABLE_FIELDS if getattr(c, k) != old[k]}
+        if changed:
+            c.save()
+
+        if "display_mode" in changed:
             QMessageBox.information(
                 self, "Restart Required",
                 f"Display mode changed to {c.display_mode.replace('_',' ').title()}.\n"
@@ -387,7 +465,19 @@ class ManagerWindow(QDialog):
     # DGX Info fetch
     # ------------------------------------------------------------------
 
+    def _is_connected(self) -> bool:
+        # Read live: the link can drop or come up while the dialog is open
+        return bool(self._conn and self._conn.connected)
+
+    def _update_conn_badge(self):
+        connected = self._is_connected()
+        self._conn_badge.setText("● Connected" if connected else "● Offline")
+        self._conn_badge.setStyleSheet(
+            _BADGE_CONNECTED_QSS if connected else _BADGE_OFFLINE_QSS
+        )
+
     def _fetch_dgx_info(self):
+        self._update_conn_badge()
         self._info_thread = _SystemInfoThread(self._conn)   # keep ref — prevents GC crash
         self._info_thread.result.connect(self._on_dgx_info)
         self._info_thread.start()
@@ -407,17 +497,14 @@ class ManagerWindow(QDialog):
             os_str = os_str[:28] + "…"
         self._card_os.set_value(os_str)
         self._card_disk.set_value(f"{info.get('disk_free_gb', '—')} GB")
-        gpus = info.get("gpus", [])
-        if gpus:
-            lines = []
-            for g in gpus:
-                lines.append(
-                    f"{g['name']}  "
-                    f"{g['memory_free_mb']}/{g['memory_total_mb']} MB free"
-                )
-            self._lbl_gpu.setText("\n".join(lines))
-        else:
-            self._lbl_gpu.setText("No GPU info available")
+        gpu_text = "\n".join(
+            f"{g['name']}  {g['memory_free_mb']}/{g['memory_total_mb']} MB free"
+            for g in info.get("gpus", [])
+        ) or "No GPU info available"
+        # Unchanged between refreshes most of the time — skip the relayout
+        if gpu_text != self._last_gpu_text:
+            self._last_gpu_text = gpu_text
+            self._lbl_gpu.setText(gpu_text)
 
     # ------------------------------------------------------------------
     # Tools
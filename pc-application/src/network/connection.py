@@ -5,36 +5,184 @@ Thread-safe. Emits callbacks for frame arrival and disconnection.
 """
 
 import socket
-import json
 import threading
 import hashlib
 import logging
+import mmap
+import select
+import selectors
 import time
 import shutil
 import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic
+from functools import lru_cache
 from typing import Optional, Callable
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parents[3]))
-from shared.protocol import send_json, recv_line, recv_exact, CHUNK_SIZE
+from shared.protocol import encode_json, decode_json, send_json, recv_line
 
 log = logging.getLogger("pc.connection")
 
 CONNECT_TIMEOUT = 5.0
+# The push port is optional and a firewall that only opens the older ports
+# silently drops its SYN; give up quickly and keep pushes on the RPC socket.
+PUSH_CONNECT_TIMEOUT = 1.0
 RPC_TIMEOUT     = 8.0
+# Standing timeout on the RPC socket, set once after the hello.  Each recv
+# wakes at least this often so a reply's overall deadline can be checked
+# between reads without toggling the socket mode per request.
+RPC_POLL        = 0.5
+SENDFILE_BLOCK  = 4 * 1024 * 1024   # bytes per sendfile() call / progress tick
+RECV_BLOCK      = 1024 * 1024       # reusable get_file receive buffer
+MOUSE_MOVE_INTERVAL = 0.002         # 500 Hz ceiling for coalesced mouse moves
+MAX_FRAME_SIZE  = 20_000_000        # sanity cap on a single video frame
+WAITALL_MIN     = 64 * 1024         # frame remainder worth one MSG_WAITALL read
+_MSG_WAITALL    = getattr(socket, "MSG_WAITALL", 0)
+
+# Per-channel socket tuning (see _make_socket)
+VIDEO_RCVBUF    = 8 * 1024 * 1024   # ~BDP of a 10 Gbit LAN at a few ms RTT
+INPUT_SNDBUF    = 64 * 1024         # input events are tiny — keep the queue short
+_SO_RCVBUFFORCE = getattr(socket, "SO_RCVBUFFORCE", 33)   # Linux, needs CAP_NET_ADMIN
+
+# Pre-encoded wire templates for the hottest input events — byte-for-byte
+# what encode_json() produces, without a json.dumps per event.
+_MOUSE_MOVE_FMT = b'{"type":"mouse_move","x":%d,"y":%d}\n'
+_MOUSE_BUTTON_FMT = {
+    (kind, button): f'{{"type":"{kind}","button":"{button}","x":%d,"y":%d}}\n'.encode()
+    for kind in ("mouse_press", "mouse_release")
+    for button in ("left", "right", "middle")
+}
+_IOV_MAX = 1024                     # buffers per sendmsg() call (Linux UIO_MAXIOV)
+
+
+@lru_cache(maxsize=512)
+def _encode_key_event(kind: str, key: str, modifiers: tuple) -> bytes:
+    """Wire line for a key event — typing repeats the same few keys."""
+    return encode_json({"type": kind, "key": key, "modifiers": list(modifiers)})
+
+
+def _sendmsg_all(sock: socket.socket, bufs: list) -> None:
+    """Gather-write every buffer with sendmsg(), resuming after partial sends."""
+    bufs = [memoryview(b) for b in bufs]
+    while bufs:
+        sent = sock.sendmsg(bufs[:_IOV_MAX])
+        while sent:
+            if sent >= len(bufs[0]):
+                sent -= len(bufs.pop(0))
+            else:
+                bufs[0] = bufs[0][sent:]
+                sent = 0
+
+
+def _sha256_file(path: Path) -> str:
+    """SHA-256 of a file via mmap — hashlib releases the GIL on the buffer."""
+    with path.open("rb") as f:
+        if path.stat().st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+
+
+class _FrameReader:
+    """
+    Cuts length-prefixed video frames (4-byte big-endian size + JPEG) out
+    of one reusable receive buffer.  A single large recv often carries a
+    header, its body and the next header, so frames cost no extra syscalls.
+    The rest of a large JPEG body is read with MSG_WAITALL, letting the
+    kernel wait for all of it instead of looping in Python.
+    """
+
+    def __init__(self):
+        self._buf   = bytearray(2 * 1024 * 1024)   # grows to the largest frame seen
+        self._view  = memoryview(self._buf)
+        self._start = 0                            # received, unparsed bytes:
+        self._end   = 0                            # _buf[_start:_end]
+        self._want  = 0                            # bytes missing from the current frame
+
+    def recv_from(self, sock: socket.socket) -> bool:
+        """One recv_into at the end of the buffer.  False on EOF."""
+        want = self._want
+        if want >= WAITALL_MIN and _MSG_WAITALL:
+            # May still return short (signal / EOF) — frames() copes
+            n = sock.recv_into(self._view[self._end:], want, _MSG_WAITALL)
+        else:
+            n = sock.recv_into(self._view[self._end:])
+        if not n:
+            return False
+        self._end += n
+        return True
+
+    def frames(self):
+        """Yield each complete frame as a memoryview, valid until the next
+        recv_from()."""
+        while True:
+            avail = self._end - self._start
+            if avail < 4:
+                self._want = 0
+                self._reserve(4)
+                return
+            size = int.from_bytes(self._view[self._start:self._start + 4], "big")
+            if size == 0 or size > MAX_FRAME_SIZE:   # sanity: skip the header
+                self._start += 4
+                continue
+            if avail < 4 + size:
+                self._want = 4 + size - avail
+                self._reserve(4 + size)
+                return
+            body = self._start + 4
+            self._start = body + size
+            yield self._view[body:self._start]
+
+    def _reserve(self, need: int) -> None:
+        """Make room for `need` bytes from _start, moving the tail to the
+        front (and growing the buffer) only when the end is reached."""
+        if self._start == self._end:
+            self._start = self._end = 0
+        if self._start + need <= len(self._buf):
+            return
+        pending = self._buf[self._start:self._end]
+        if need > len(self._buf):
+            self._buf  = bytearray(max(need, len(self._buf) * 2))
+            self._view = memoryview(self._buf)
+        self._buf[:len(pending)] = pending
+        self._start, self._end = 0, len(pending)
+
+
+class _LineReader:
+    """Splits newline-delimited JSON messages out of a socket byte stream."""
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def recv_from(self, sock: socket.socket) -> bool:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return False
+        self._buf += chunk
+        return True
+
+    def lines(self):
+        while (nl := self._buf.find(b"\n")) >= 0:
+            line = bytes(self._buf[:nl])
+            del self._buf[:nl + 1]
+            yield line
 
 
 class DGXConnection:
     """
-    Manages three TCP channels to DGX:
+    Manages the TCP channels to DGX:
       • Control / RPC  (22010)
       • Video stream   (22011)
       • Input events   (22012)
+      • Push messages  (22013) — optional; older services push on RPC
     """
 
     def __init__(self,
-                 on_frame:         Optional[Callable[[bytes], None]] = None,
+                 on_frame:         Optional[Callable[[memoryview], None]] = None,
                  on_disconnect:    Optional[Callable]                = None,
                  on_ping_update:   Optional[Callable[[float], None]] = None,
                  on_cursor:        Optional[Callable[[str], None]]   = None,
@@ -46,6 +194,7 @@ class DGXConnection:
         self._rpc_sock:   Optional[socket.socket] = None
         self._video_sock: Optional[socket.socket] = None
         self._input_sock: Optional[socket.socket] = None
+        self._push_sock:  Optional[socket.socket] = None
         self._rpc_lock    = threading.Lock()
         self._connected   = False
         self._dgx_ip      = ""
@@ -56,11 +205,14 @@ class DGXConnection:
         self._on_cursor         = on_cursor
         self._on_file_received  = on_file_received
 
-        # Mouse-move coalescing: only the latest position is sent per cycle
+        # Encoded input events, written in batches by _input_writer_loop.
+        # Mouse moves are coalesced: only the latest position is kept.
+        # All of it is guarded by _input_cond.
+        self._input_queue: deque = deque()
+        self._input_cond  = threading.Condition()
         self._mouse_x:    int   = -1
         self._mouse_y:    int   = -1
         self._mouse_dirty = False
-        self._mouse_lock  = threading.Lock()
 
         # Stats
         self.ping_ms:     float = 0.0
@@ -80,68 +232,122 @@ class DGXConnection:
     # ------------------------------------------------------------------
 
     def connect(self, dgx_ip: str, rpc_port: int = 22010,
-                video_port: int = 22011, input_port: int = 22012) -> dict:
+                video_port: int = 22011, input_port: int = 22012,
+                push_port: int = 0) -> dict:
         """
-        Open all three channels, complete handshake, start video thread.
+        Open all channels, complete handshake, start video thread.
         Returns DGX info dict. Raises on failure.
+        push_port=0 (or an unreachable port) keeps pushes on the RPC socket.
+        Sockets are tuned per channel (see _make_socket); on a Linux client
+        with root, `tc qdisc replace dev <nic> root fq` further trims
+        latency for the small input packets.
         """
         self._dgx_ip = dgx_ip
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="Connect")
         try:
-            # 1. Control channel + handshake
-            self._rpc_sock = self._make_socket(dgx_ip, rpc_port)
+            # 1+2. Control and push channels, opened concurrently.  The push
+            #      channel exists before the hello so the DGX knows whether
+            #      to route pushes away from the RPC socket.
+            rpc = pool.submit(self._open_channel, "_rpc_sock",
+                              dgx_ip, rpc_port, "rpc", None)
+            if push_port:
+                pool.submit(self._open_push_channel, dgx_ip, push_port).result()
+            rpc.result()
+
+            # 3. Handshake
             send_json(self._rpc_sock, {
                 "type":         "hello",
                 "agent":        "PC",
                 "version":      "1.0",
-                "capabilities": ["file_transfer", "screen_view", "input_control"]
+                "capabilities": ["file_transfer", "screen_view", "input_control"],
+                "push_channel": self._push_sock is not None,
             })
             raw  = recv_line(self._rpc_sock)
-            info = json.loads(raw)
+            info = decode_json(raw)
             if not info.get("ok"):
                 raise ConnectionError(f"Handshake rejected: {info.get('error')}")
-
-            # 2. Video channel
-            self._video_sock = self._make_socket(dgx_ip, video_port)
-            send_json(self._video_sock, {
-                "type":     "start_stream",
-                "fps":      60,
-                "encoding": "jpeg",
-                "quality":  95
-            })
-
-            # 3. Input channel
-            self._input_sock = self._make_socket(dgx_ip, input_port)
-            send_json(self._input_sock, {"type": "start_input"})
+            self._rpc_sock.settimeout(RPC_POLL)
+
+            # 4+5. Video and input channels, opened concurrently
+            video = pool.submit(self._open_channel, "_video_sock",
+                                dgx_ip, video_port, "video", {
+                                    "type":     "start_stream",
+                                    "fps":      60,
+                                    "encoding": "jpeg",
+                                    "quality":  95
+                                })
+            inp = pool.submit(self._open_channel, "_input_sock",
+                              dgx_ip, input_port, "input", {"type": "start_input"})
+            video.result()
+            inp.result()
 
             self._connected = True
 
-            # Start background threads
-            if self._on_frame:
-                threading.Thread(target=self._video_loop,
-                                  name="VideoReceiver", daemon=True).start()
-            threading.Thread(target=self._rpc_push_loop,
-                              name="RPCPushListener", daemon=True).start()
-            threading.Thread(target=self._ping_loop,
-                              name="PingMonitor", daemon=True).start()
-            threading.Thread(target=self._mouse_flush_loop,
-                              name="MouseFlusher", daemon=True).start()
+            # Start background threads: one receiver for video + pushes,
+            # one writer for input.  Ping comes from DGX heartbeats on the
+            # push channel; older services need the polling fallbacks.
+            if self._on_frame or self._push_sock:
+                threading.Thread(target=self._receive_loop,
+                                  name="Receiver", daemon=True).start()
+            if not self._push_sock:
+                threading.Thread(target=self._rpc_push_loop,
+                                  name="RPCPushListener", daemon=True).start()
+                threading.Thread(target=self._ping_loop,
+                                  name="PingMonitor", daemon=True).start()
+            threading.Thread(target=self._input_writer_loop,
+                              name="InputWriter", daemon=True).start()
 
             log.info(f"Connected to DGX @ {dgx_ip}")
             return info
 
         except Exception:
+            pool.shutdown(wait=True)   # let in-flight connects land before cleanup
             self.disconnect()
             raise
+        finally:
+            pool.shutdown(wait=False)
+
+    def _open_channel(self, attr: str, host: str, port: int,
+                      purpose: str, start_msg: Optional[dict],
+                      timeout: float = CONNECT_TIMEOUT) -> None:
+        """Connect one channel, store it on `attr`, send its opening message."""
+        sock = self._make_socket(host, port, purpose, timeout)
+        setattr(self, attr, sock)
+        if start_msg:
+            send_json(sock, start_msg)
+
+    def _open_push_channel(self, host: str, port: int) -> None:
+        """Open the push channel; older services without one fall back to
+        pushes on the RPC socket."""
+        try:
+            self._open_channel("_push_sock", host, port, "rpc",
+                               {"type": "start_push"}, PUSH_CONNECT_TIMEOUT)
+        except OSError as e:
+            log.info("No push channel on port %d (%s) — using RPC socket; "
+                     "open TCP %d on the DGX firewall to enable it", port, e, port)
+            sock, self._push_sock = self._push_sock, None
+            if sock:
+                sock.close()
 
     def disconnect(self):
         self._connected = False
-        for sock in (self._rpc_sock, self._video_sock, self._input_sock):
+        for sock in (self._rpc_sock, self._video_sock, self._input_sock,
+                     self._push_sock):
             if sock:
+                try:
+                    # shutdown() wakes threads blocked in recv on this socket
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
                 try:
                     sock.close()
                 except Exception:
                     pass
         self._rpc_sock = self._video_sock = self._input_sock = None
+        self._push_sock = None
+        with self._input_cond:
+            self._input_queue.clear()
+            self._input_cond.notify_all()
         if self._on_disconnect:
             self._on_disconnect()
 
@@ -150,36 +356,51 @@ class DGXConnection:
     # ------------------------------------------------------------------
 
     def send_mouse_move(self, x: int, y: int):
-        """Queue a mouse move — coalesced and flushed by _mouse_flush_loop."""
-        with self._mouse_lock:
+        """Queue a mouse move — coalesced and flushed by _input_writer_loop."""
+        with self._input_cond:
             self._mouse_x = x
             self._mouse_y = y
             self._mouse_dirty = True
+            self._input_cond.notify()
 
     def send_mouse_press(self, button: str, x: int, y: int):
-        self._send_input({"type": "mouse_press", "button": button, "x": x, "y": y})
+        self._send_mouse_button("mouse_press", button, x, y)
 
     def send_mouse_release(self, button: str, x: int, y: int):
-        self._send_input({"type": "mouse_release", "button": button, "x": x, "y": y})
+        self._send_mouse_button("mouse_release", button, x, y)
+
+    def _send_mouse_button(self, kind: str, button: str, x: int, y: int):
+        fmt = _MOUSE_BUTTON_FMT.get((kind, button))
+        if fmt is not None:
+            self._send_input_raw(fmt % (x, y))
+        else:
+            self._send_input({"type": kind, "button": button, "x": x, "y": y})
 
     def send_mouse_scroll(self, dy: int, x: int, y: int):
         self._send_input({"type": "mouse_scroll", "dy": dy, "x": x, "y": y})
 
     def send_key_press(self, key: str, modifiers: list = None):
-        self._send_input({"type": "key_press", "key": key,
-                           "modifiers": modifiers or []})
+        self._send_input_raw(_encode_key_event("key_press", key,
+                                               tuple(modifiers or ())))
 
     def send_key_release(self, key: str, modifiers: list = None):
-        self._send_input({"type": "key_release", "key": key,
-                           "modifiers": modifiers or []})
+        self._send_input_raw(_encode_key_event("key_release", key,
+                                               tuple(modifiers or ())))
 
     def _send_input(self, event: dict):
+        self._send_input_raw(encode_json(event))
+
+    def _send_input_raw(self, line: bytes):
+        """Queue one already-encoded JSON line for _input_writer_loop."""
         if not self._input_sock or not self._connected:
             return
-        try:
-            send_json(self._input_sock, event)
-        except Exception:
-            self._connected = False
+        with self._input_cond:
+            # A pending move goes first so the event lands where the mouse is
+            if self._mouse_dirty:
+                self._input_queue.append(_MOUSE_MOVE_FMT % (self._mouse_x, self._mouse_y))
+                self._mouse_dirty = False
+            self._input_queue.append(line)
+            self._input_cond.notify()
 
     # ------------------------------------------------------------------
     # RPC — request/response on control channel (thread-safe)
@@ -190,19 +411,15 @@ class DGXConnection:
             if not self._rpc_sock:
                 return {"ok": False, "error": "not_connected"}
             try:
-                self._rpc_sock.settimeout(timeout)
                 send_json(self._rpc_sock, request)
-                raw = recv_line(self._rpc_sock, max_bytes=512_000)
-                return json.loads(raw)
+                raw = self._recv_line_within(self._rpc_sock, timeout, 512_000)
+                return decode_json(raw)
             except socket.timeout:
                 return {"ok": False, "error": "timeout"}
             except Exception as e:
                 log.error(f"RPC error: {e}")
                 self._connected = False
                 return {"ok": False, "error": str(e)}
-            finally:
-                if self._rpc_sock:
-                    self._rpc_sock.settimeout(None)
 
     # ------------------------------------------------------------------
     # File Transfer
@@ -210,11 +427,29 @@ class DGXConnection:
 
     def send_file(self, local_path: str, remote_folder: str = "inbox",
                   progress_cb: Optional[Callable[[int, int], None]] = None,
-                  metadata: dict = None) -> dict:
-        from pathlib import Path as P
-        p    = P(local_path)
+                  metadata: dict = None,
+                  local_sha256: Optional[Future] = None) -> dict:
+        """
+        Upload one file.  `local_sha256` is a Future for the file's hex
+        SHA-256 the caller already started (e.g. while the previous file
+        was sending); without one the file is hashed on a side thread
+        while the kernel streams it.
+        """
+        p    = Path(local_path)
         size = p.stat().st_size
-        hasher = hashlib.sha256()
+
+        if local_sha256 is None:
+            local_sha256 = Future()
+            local_sha256.set_running_or_notify_cancel()
+
+            def _hash():
+                try:
+                    local_sha256.set_result(_sha256_file(p))
+                except Exception as exc:
+                    local_sha256.set_exception(exc)
+
+            threading.Thread(target=_hash, name="SendFileHash",
+                             daemon=True).start()
 
         with self._rpc_lock:
             try:
@@ -232,22 +467,32 @@ class DGXConnection:
                     payload["metadata"] = metadata
                 send_json(self._rpc_sock, payload)
 
+                # socket.sendfile() uses zero-copy os.sendfile() where the
+                # platform has it and falls back to send() elsewhere (Windows)
                 sent = 0
                 with p.open("rb") as f:
-                    while chunk := f.read(CHUNK_SIZE):
-                        self._rpc_sock.sendall(chunk)
-                        hasher.update(chunk)
-                        sent += len(chunk)
+                    while sent < size:
+                        n = self._rpc_sock.sendfile(
+                            f, sent, min(SENDFILE_BLOCK, size - sent))
+                        if not n:
+                            raise ConnectionError("File shrank during send")
+                        sent += n
                         if progress_cb:
                             progress_cb(sent, size)
 
                 raw    = recv_line(self._rpc_sock)
-                result = json.loads(raw)
+                result = decode_json(raw)
+                try:
+                    local_hex = local_sha256.result()
+                except Exception:
+                    local_hex = ""
+                if not local_hex:
+                    return {"ok": False, "error": "local checksum failed"}
                 # Server returns "sha256" field; accept either key for compat
                 remote_hex = result.get("sha256") or result.get("checksum", "")
-                if remote_hex and remote_hex != hasher.hexdigest():
+                if remote_hex and remote_hex != local_hex:
                     return {"ok": False, "error": "checksum_mismatch"}
-                result["local_sha256"] = hasher.hexdigest()
+                result["local_sha256"] = local_hex
                 return result
 
             except Exception as e:
@@ -255,12 +500,14 @@ class DGXConnection:
                 return {"ok": False, "error": str(e)}
             finally:
                 if self._rpc_sock:
-                    self._rpc_sock.settimeout(None)
+                    self._rpc_sock.settimeout(RPC_POLL)
 
     def get_file(self, filename: str, folder: str,
                  local_dest: str,
                  progress_cb: Optional[Callable[[int, int], None]] = None) -> dict:
         """Download a file from DGX to local_dest path."""
+        dest    = Path(local_dest)
+        written = False     # dest created: remove it again on any failure
         with self._rpc_lock:
             try:
                 # Start with a generous header timeout, then scale once size is known.
@@ -269,96 +516,124 @@ class DGXConnection:
                     "type": "get_file", "filename": filename, "folder": folder
                 })
                 raw    = recv_line(self._rpc_sock)
-                header = json.loads(raw)
+                header = decode_json(raw)
                 if not header.get("ok"):
                     return header
 
                 size   = int(header["size"])
                 timeout_s = max(600.0, 120.0 + (size / (8 * 1024 * 1024)))
                 self._rpc_sock.settimeout(timeout_s)
-                hasher = hashlib.sha256()
                 recv   = 0
-
-                from pathlib import Path as P
-                with P(local_dest).open("wb") as f:
+                # One reusable receive buffer; the destination is sized up
+                # front so the filesystem can allocate it in one extent.
+                buf  = bytearray(min(RECV_BLOCK, size) or 1)
+                view = memoryview(buf)
+                recv_into = self._rpc_sock.recv_into
+                with dest.open("wb") as f:
+                    written = True
+                    if size:
+                        f.truncate(size)
                     while recv < size:
-                        chunk = self._rpc_sock.recv(
-                            min(CHUNK_SIZE, size - recv))
-                        if not chunk:
+                        n = recv_into(view, min(len(buf), size - recv))
+                        if not n:
                             raise ConnectionError("Disconnected mid-download")
-                        f.write(chunk)
-                        hasher.update(chunk)
-                        recv += len(chunk)
+                        f.write(view[:n])
+                        recv += n
                         if progress_cb:
                             progress_cb(recv, size)
 
-                # Read checksum response
+                # Read checksum response, then hash the finished file in one
+                # C-level pass instead of per-chunk on the receive loop
                 raw    = recv_line(self._rpc_sock)
-                result = json.loads(raw)
-                if result.get("checksum") and result["checksum"] != hasher.hexdigest():
+                result = decode_json(raw)
+                remote_hex = result.get("sha256") or result.get("checksum", "")
+                if remote_hex and remote_hex != _sha256_file(dest):
+                    # Preallocated to full size, so a bad file would look
+                    # complete; don't leave it behind
+                    dest.unlink(missing_ok=True)
                     return {"ok": False, "error": "checksum_mismatch"}
                 return {"ok": True, "filename": filename, "size": size}
 
             except Exception as e:
                 self._connected = False
+                if written:
+                    try:
+                        dest.unlink(missing_ok=True)
+                    except OSError:
+                        pass
                 return {"ok": False, "error": str(e)}
             finally:
                 if self._rpc_sock:
-                    self._rpc_sock.settimeout(None)
+                    self._rpc_sock.settimeout(RPC_POLL)
 
     # ------------------------------------------------------------------
     # Background threads
     # ------------------------------------------------------------------
 
-    def _video_loop(self):
-        """Continuously read JPEG frames and call on_frame callback.
-        Wire format: 4-byte big-endian length (uint32) followed by JPEG bytes.
+    def _receive_loop(self):
         """
-        import struct
-        _fps_times = []
-        while self._connected and self._video_sock:
-            try:
-                # Read 4-byte length header
-                header_bytes = b""
-                while len(header_bytes) < 4:
-                    chunk = self._video_sock.recv(4 - len(header_bytes))
-                    if not chunk:
-                        raise ConnectionResetError("Video socket closed")
-                    header_bytes += chunk
-
-                size = struct.unpack(">I", header_bytes)[0]
-                if size == 0 or size > 20_000_000:   # sanity: 0 or >20 MB
-                    continue
+        Single receiver thread: one selector waits on the video socket and
+        the push channel and hands whatever arrived to the matching reader.
+        Ends (and reports the disconnect) when the video stream closes.
+        """
+        sel = selectors.DefaultSelector()
+        if self._on_frame:
+            sel.register(self._video_sock, selectors.EVENT_READ, _FrameReader())
+        if self._push_sock:
+            sel.register(self._push_sock, selectors.EVENT_READ, _LineReader())
+        fps_times: deque = deque(maxlen=120)
+        # Hot-path lookups bound once
+        wait, dispatch = sel.select, self._dispatch_frame
+        handle_push, decode = self._handle_push, decode_json
+        try:
+            while self._connected and sel.get_map():
+                for key, _ in wait(timeout=0.5):
+                    reader = key.data
+                    if not reader.recv_from(key.fileobj):
+                        sel.unregister(key.fileobj)
+                        if isinstance(reader, _FrameReader):
+                            raise ConnectionResetError("Video socket closed")
+                        continue
+                    if isinstance(reader, _FrameReader):
+                        for frame in reader.frames():
+                            dispatch(frame, fps_times)
+                    else:
+                        for raw in reader.lines():
+                            try:
+                                handle_push(decode(raw))
+                            except Exception as e:
+                                log.debug("Push handling error: %s", e)
+        except (ConnectionError, OSError, ValueError) as e:
+            log.debug("Receive loop ended: %s", e)
+        finally:
+            sel.close()
+        if self._on_frame:
+            self._connected = False
+            if self._on_disconnect:
+                self._on_disconnect()
 
-                # Read exactly `size` bytes of JPEG
-                data = recv_exact(self._video_sock, size)
-                self.bytes_recv += size
+    def _dispatch_frame(self, frame: memoryview, fps_times: deque) -> None:
+        self.bytes_recv += len(frame)
 
-                # FPS tracking (1-second window)
-                now = time.monotonic()
-                _fps_times.append(now)
-                _fps_times = [t for t in _fps_times if now - t <= 1.0]
-                self.fps_actual = len(_fps_times)
+        # FPS tracking (1-second window)
+        now = monotonic()
+        fps_times.append(now)
+        while now - fps_times[0] > 1.0:
+            fps_times.popleft()
+        self.fps_actual = len(fps_times)
 
-                if self._on_frame:
-                    self._on_frame(data)
-            except (ConnectionError, OSError, struct.error):
-                break
-            except Exception as e:
-                log.debug(f"Video loop error: {e}")
-        self._connected = False
-        if self._on_disconnect:
-            self._on_disconnect()
+        try:
+            self._on_frame(frame)
+        except Exception as e:
+            log.debug(f"Video frame error: {e}")
 
     def _rpc_push_loop(self):
         """
-        Listens for unsolicited push messages from DGX on a dedicated
-        push socket (same RPC socket, but reads only when the rpc_lock
-        is not held).  Handles: cursor_shape, resolution_changed.
-        We use a separate socket-level read with a short select loop so
-        we don’t block rpc().
+        Fallback for DGX services without a push channel: listens for
+        pushes interleaved on the RPC socket, reading only when the
+        rpc_lock is not held.  We use a short select loop so we don’t
+        block rpc().
         """
-        import select, json
         # We need our own socket handle for pushes to avoid contention
         # with the request/response rpc() method.  The simplest safe
         # approach: use a non-blocking peek loop with select.
@@ -371,38 +646,50 @@ class DGXConnection:
                 # Only read if no RPC call is in flight
                 if self._rpc_lock.acquire(blocking=False):
                     try:
-                        self._rpc_sock.settimeout(0.1)
-                        raw = recv_line(self._rpc_sock)
+                        # rpc() may have consumed the data before we got the lock
+                        self._wait_readable(self._rpc_sock, 0)
+                        raw = self._recv_line_within(self._rpc_sock, RPC_TIMEOUT)
                         if not raw:
                             continue
-                        msg = json.loads(raw)
+                        msg = decode_json(raw)
                     except Exception:
                         continue
                     finally:
-                        if self._rpc_sock:
-                            self._rpc_sock.settimeout(None)
                         self._rpc_lock.release()
 
-                    t = msg.get("type", "")
-                    if t == "cursor_shape" and self._on_cursor:
-                        self._on_cursor(msg.get("shape", "arrow"))
-                    elif t == "resolution_changed":
-                        log.info("DGX resolution changed: %s", msg)
-                    elif t == "file_available":
-                        # DGX Manager pushed a file to SharedDrive — auto-download
-                        threading.Thread(
-                            target=self._download_pushed_file,
-                            args=(msg,),
-                            daemon=True,
-                        ).start()
-                    elif t == "pong":
-                        pass  # swallow stale pongs
-                    else:
-                        log.debug("Unhandled push: %s", t)
+                    self._handle_push(msg)
             except Exception as e:
                 log.debug("RPC push loop error: %s", e)
                 break
 
+    def _handle_push(self, msg: dict) -> None:
+        """Dispatch one push message.  Handles: heartbeat, cursor_shape,
+        resolution_changed, file_available."""
+        t = msg.get("type", "")
+        if t == "heartbeat":
+            # Echo on the input channel; DGX reports the measured RTT back
+            self._send_input({"type": "heartbeat_ack", "ts": msg.get("ts", 0.0)})
+            rtt_ms = msg.get("rtt_ms")
+            if rtt_ms is not None:
+                self.ping_ms = rtt_ms
+                if self._on_ping_update:
+                    self._on_ping_update(self.ping_ms)
+        elif t == "cursor_shape" and self._on_cursor:
+            self._on_cursor(msg.get("shape", "arrow"))
+        elif t == "resolution_changed":
+            log.info("DGX resolution changed: %s", msg)
+        elif t == "file_available":
+            # DGX Manager pushed a file to SharedDrive — auto-download
+            threading.Thread(
+                target=self._download_pushed_file,
+                args=(msg,),
+                daemon=True,
+            ).start()
+        elif t == "pong":
+            pass  # swallow stale pongs
+        else:
+            log.debug("Unhandled push: %s", t)
+
     def _download_pushed_file(self, msg: dict) -> None:
         """
         Called in a background thread when the DGX pushes a file_available
@@ -413,15 +700,14 @@ class DGXConnection:
         root_name = str(msg.get("root_name", "")).strip()
         if not filename:
             return
-        from pathlib import Path as _P
         # Save into <repo>/received/ rather than ~/Downloads/
-        downloads = _P(__file__).parents[3] / "received"
+        downloads = Path(__file__).parents[3] / "received"
         downloads.mkdir(exist_ok=True)
 
         if is_dir:
             archive_dest = downloads / filename
-            archive_stem = _P(filename).stem
-            archive_suffix = _P(filename).suffix or ".zip"
+            archive_stem = Path(filename).stem
+            archive_suffix = Path(filename).suffix or ".zip"
             n = 1
             while archive_dest.exists():
                 archive_dest = downloads / f"{archive_stem} ({n}){archive_suffix}"
@@ -468,8 +754,8 @@ class DGXConnection:
 
         # Avoid overwriting — add a numeric suffix if needed
         dest = downloads / filename
-        stem = _P(filename).stem
-        suffix = _P(filename).suffix
+        stem = Path(filename).stem
+        suffix = Path(filename).suffix
         n = 1
         while dest.exists():
             dest = downloads / f"{stem} ({n}){suffix}"
@@ -484,26 +770,47 @@ class DGXConnection:
         elif not result.get("ok"):
             log.warning("Auto-download of pushed file failed: %s", result)
 
-    def _mouse_flush_loop(self):
+    def _input_writer_loop(self):
         """
-        Dedicated thread: sends the latest queued mouse position as fast
-        as the socket allows.  Runs at ~500 Hz (0.002 s sleep) — well above
-        the DGX display rate so no moves are perceptibly dropped.  Coalescing
-        means high-frequency PC polling (165 Hz) never floods the TCP buffer.
+        Dedicated thread for the input channel: wakes when an event is
+        queued or the mouse moves and writes everything pending with a
+        single gather write (sendmsg; joined sendall where unavailable).  Mouse moves are coalesced to the latest position
+        and capped at ~500 Hz — well above the DGX display rate so no moves
+        are perceptibly dropped; an idle mouse costs no wakeups.
         """
-        import time as _time
+        last_move = 0.0
         while self._connected and self._input_sock:
-            with self._mouse_lock:
-                dirty = self._mouse_dirty
-                x, y  = self._mouse_x, self._mouse_y
-                if dirty:
+            with self._input_cond:
+                while self._connected and not self._input_queue:
+                    if not self._mouse_dirty:
+                        self._input_cond.wait(0.5)
+                        continue
+                    delay = last_move + MOUSE_MOVE_INTERVAL - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._input_cond.wait(delay)
+                if self._mouse_dirty:
+                    self._input_queue.append(_MOUSE_MOVE_FMT % (self._mouse_x, self._mouse_y))
                     self._mouse_dirty = False
-            if dirty:
-                self._send_input({"type": "mouse_move", "x": x, "y": y})
-            _time.sleep(0.002)   # 500 Hz ceiling — adjust if needed
+                    last_move = time.monotonic()
+                batch = list(self._input_queue)
+                self._input_queue.clear()
+            if not batch:
+                continue
+            sock = self._input_sock
+            if not sock:
+                break
+            try:
+                if len(batch) > 1 and hasattr(sock, "sendmsg"):
+                    _sendmsg_all(sock, batch)
+                else:
+                    sock.sendall(b"".join(batch))
+            except Exception:
+                self._connected = False
 
     def _ping_loop(self):
-        """Send a ping every 2 seconds, update ping_ms."""
+        """Send a ping RPC every 2 seconds, update ping_ms.
+        Only used against DGX services without a push channel."""
         while self._connected:
             t0 = time.monotonic()
             result = self.rpc({"type": "ping", "ts": t0}, timeout=3.0)
@@ -518,10 +825,75 @@ class DGXConnection:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _make_socket(host: str, port: int) -> socket.socket:
+    def _wait_readable(sock: socket.socket, timeout: float) -> None:
+        """Block until sock has data, or raise socket.timeout."""
+        ready, _, _ = select.select([sock], [], [], timeout)
+        if not ready:
+            raise socket.timeout("timed out")
+
+    @staticmethod
+    def _recv_line_within(sock: socket.socket, timeout: float,
+                          max_bytes: int = 65536) -> bytes:
+        """
+        recv_line bounded by `timeout` for the whole reply, so a line that
+        stalls midway raises socket.timeout instead of hanging the caller
+        (and everyone queued on _rpc_lock).  Relies on the socket's standing
+        RPC_POLL timeout: each recv wakes by then and the deadline is
+        checked between reads.  Like recv_line it peeks first, so bytes
+        after the newline stay in the socket.
+        """
+        deadline = monotonic() + timeout
+        buf = bytearray()
+        while True:
+            if len(buf) >= max_bytes:
+                raise ValueError(f"recv_line exceeded {max_bytes} bytes without newline")
+            try:
+                chunk = sock.recv(4096, socket.MSG_PEEK)
+            except socket.timeout:
+                if monotonic() >= deadline:
+                    raise
+                continue
+            if not chunk:
+                raise ConnectionError("Remote end disconnected")
+            nl   = chunk.find(b"\n")
+            take = nl + 1 if nl >= 0 else len(chunk)
+            # The peeked bytes are already buffered, so these reads return
+            # without waiting
+            while take:
+                part = sock.recv(take)
+                if not part:
+                    raise ConnectionError("Remote end disconnected")
+                buf += part
+                take -= len(part)
+            if nl >= 0:
+                return bytes(buf[:-1])
+            if monotonic() >= deadline:
+                raise socket.timeout("timed out")
+
+    @staticmethod
+    def _make_socket(host: str, port: int, purpose: str = "rpc",
+                     timeout: float = CONNECT_TIMEOUT) -> socket.socket:
+        """
+        Open a TCP connection tuned for its channel:
+          "video" — large receive buffer so bulk frames keep flowing under load
+          "input" — small send buffer and quick ACKs for tiny, frequent events
+          "rpc"   — defaults
+        Buffer sizes are set before connect() so the window scale follows.
+        """
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-        sock.settimeout(CONNECT_TIMEOUT)
+        if purpose == "video":
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, _SO_RCVBUFFORCE, VIDEO_RCVBUF)
+            except OSError:
+                # Unprivileged / non-Linux: capped by net.core.rmem_max
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, VIDEO_RCVBUF)
+        elif purpose == "input":
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, INPUT_SNDBUF)
+        sock.settimeout(timeout)
         sock.connect((host, port))
         sock.settimeout(None)
+        if purpose == "input" and hasattr(socket, "TCP_QUICKACK"):
+            # Linux only; the kernel may drop back to delayed ACKs later
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
         return sock
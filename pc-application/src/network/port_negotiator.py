@@ -6,10 +6,13 @@ Automatic port negotiation between PC and DGX.
 Protocol:
   1. PC scans its own local ports to find 3 free ones in the range 22010-22059.
   2. PC connects to the DGX on a fixed DISCOVERY port (22000).
-  3. PC sends:  {"type": "negotiate", "candidates": [p1, p2, p3, ...]}
+  3. PC sends:  {"type": "negotiate", "candidates": [p1, p2, p3, ...],
+                 "framing": "length"}
   4. DGX checks which candidates it can bind, picks the first 3 it can use,
-     and responds: {"ok": true, "rpc": N, "video": N, "input": N}
-  5. Both sides lock in those three ports.
+     and responds: {"ok": true, "rpc": N, "video": N, "input": N, "push": N}
+     as a 4-byte big-endian length + JSON (like video frames).  Older
+     services ignore "framing" and answer with a JSON line instead.
+  5. Both sides lock in those ports ("push" is absent on older services).
 
 The discovery port (22000) is the ONLY hard-coded port in the system.
 """
@@ -18,14 +21,22 @@ import socket
 import json
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parents[3]))
+from shared.protocol import send_json, recv_line
+
 log = logging.getLogger(__name__)
 
 DISCOVERY_PORT   = 22000          # The one fixed "handshake" port on DGX
 PORT_RANGE_START = 22010
 PORT_RANGE_END   = 22059          # 50 candidates to scan
 CONNECT_TIMEOUT  = 5.0
+SCAN_BATCH       = 16             # ports probed concurrently per round
+MAX_RESPONSE     = 65536          # sanity cap on the negotiation reply
 
 
 def _is_port_free_local(port: int) -> bool:
@@ -39,18 +50,68 @@ def _is_port_free_local(port: int) -> bool:
             return False
 
 
+def ports_free_locally(ports) -> bool:
+    """Return True if every port in `ports` is free on this PC."""
+    return all(_is_port_free_local(p) for p in ports)
+
+
 def scan_local_free_ports(count: int = 3) -> list[int]:
     """
     Return up to `count` port numbers in [22010-22059] that are currently
     not in-use on this PC.
     """
-    free = []
-    for p in range(PORT_RANGE_START, PORT_RANGE_END + 1):
-        if _is_port_free_local(p):
-            free.append(p)
-            if len(free) >= count * 3:   # send plenty of candidates
+    want  = count * 3                 # send plenty of candidates
+    ports = range(PORT_RANGE_START, PORT_RANGE_END + 1)
+    free  = []
+    with ThreadPoolExecutor(max_workers=SCAN_BATCH) as pool:
+        # Probe in batches and stop as soon as enough ports are confirmed
+        for i in range(0, len(ports), SCAN_BATCH):
+            batch = ports[i:i + SCAN_BATCH]
+            free.extend(p for p, ok in zip(batch, pool.map(_is_port_free_local, batch))
+                        if ok)
+            if len(free) >= want:
                 break
-    return free
+    return free[:want]
+
+
+def _recv_into_exact(sock: socket.socket, view: memoryview) -> None:
+    """Fill `view` completely from the socket."""
+    while view:
+        n = sock.recv_into(view)
+        if not n:
+            raise ConnectionError("DGX closed the discovery connection")
+        view = view[n:]
+
+
+def _recv_response(sock: socket.socket) -> dict:
+    """
+    Read one length-prefixed JSON reply.  A reply starting with '{' comes
+    from an older service that answers with a newline-terminated line.
+    """
+    header = bytearray(4)
+    _recv_into_exact(sock, memoryview(header))
+    if header[:1] == b"{":
+        return json.loads(bytes(header) + recv_line(sock, MAX_RESPONSE))
+    size = int.from_bytes(header, "big")
+    if size > MAX_RESPONSE:
+        raise ValueError(f"Negotiation reply too large ({size} bytes)")
+    body = bytearray(size)
+    _recv_into_exact(sock, memoryview(body))
+    return json.loads(body)
+
+
+def request_ports(sock: socket.socket, candidates: list, **fields) -> dict:
+    """
+    Send a negotiate request on an open discovery socket and return the DGX
+    reply.  Extra fields (e.g. pc_ip) are passed through to the DGX.
+    """
+    send_json(sock, {
+        "type":       "negotiate",
+        "candidates": candidates,
+        "framing":    "length",
+        **fields,
+    })
+    return _recv_response(sock)
 
 
 def negotiate_ports(
@@ -61,7 +122,8 @@ def negotiate_ports(
     Connect to DGX discovery port and agree on RPC, video, and input ports.
 
     Returns:
-        {"rpc": int, "video": int, "input": int}  on success
+        {"rpc": int, "video": int, "input": int, "push": int}  on success
+        (push is 0 when the DGX has no dedicated push channel)
         None on failure
     """
     candidates = scan_local_free_ports(count=3)
@@ -74,33 +136,20 @@ def negotiate_ports(
 
     try:
         sock = socket.create_connection((dgx_ip, DISCOVERY_PORT), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
     except OSError as e:
         log.debug("Cannot reach DGX discovery port %d: %s", DISCOVERY_PORT, e)
         return None
 
     try:
-        # Send candidate list
-        msg = json.dumps({
-            "type":       "negotiate",
-            "candidates": candidates,
-        }) + "\n"
-        sock.sendall(msg.encode())
-
-        # Read response
-        buf = b""
         sock.settimeout(timeout)
-        while b"\n" not in buf:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            buf += chunk
-
-        resp = json.loads(buf.split(b"\n")[0].decode())
+        resp = request_ports(sock, candidates)
         if resp.get("ok"):
             result = {
                 "rpc":   resp["rpc"],
                 "video": resp["video"],
                 "input": resp["input"],
+                "push":  resp.get("push", 0),
             }
             log.info("Negotiated ports: RPC=%d  Video=%d  Input=%d",
                      result["rpc"], result["video"], result["input"])
@@ -6,49 +6,92 @@ First-run setup wizard.
 - Page 3: Preferences
 """
 
-import re
 import sys
 import socket
 import json
+import threading
 import time
 from pathlib import Path
 
 from PyQt6.QtWidgets import (
-    QWizard, QWizardPage, QVBoxLayout, QHBoxLayout, QFormLayout,
+    QWizard, QWizardPage, QVBoxLayout, QHBoxLayout, QFormLayout, QGridLayout,
     QLabel, QLineEdit, QPushButton, QCheckBox, QFrame, QProgressBar,
-    QSizePolicy, QWidget
+    QSizePolicy, QWidget, QPlainTextEdit
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QFont, QColor, QTextCharFormat, QTextCursor
 
 from config import Config
-from theme import ACCENT, SUCCESS, ERROR, WARNING, TEXT_DIM, BG_RAISED, BORDER, BG_SURFACE
+from theme import SUCCESS, ERROR, WARNING, TEXT_DIM
 
-IP_RE = re.compile(r"^\d{1,3}(?:\.\d{1,3}){3}$")
+# Repo root holds create_shortcuts.py
+_REPO_ROOT = str(Path(__file__).parents[2])
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+# Widgets are styled by the app-wide stylesheet in theme.py through their
+# "class" property, so Qt parses no per-widget CSS here.
+_LINK_PREFIX = "10.0.0."   # direct PC ↔ DGX link subnet
+_LOG_COLORS = {"info": TEXT_DIM, "ok": SUCCESS, "error": ERROR, "warn": WARNING}
 
 
 def _is_valid_ip(s: str) -> bool:
-    if not IP_RE.match(s.strip()):
+    """Strict dotted-quad IPv4 check, done by the C library parser."""
+    try:
+        socket.inet_pton(socket.AF_INET, s.strip())
+        return True
+    except (OSError, ValueError):
         return False
-    return all(0 <= int(p) <= 255 for p in s.strip().split("."))
+
+
+def _recv_json_line(sock: socket.socket, max_bytes: int = 8192) -> dict:
+    """
+    Read one newline-terminated JSON reply with recv_into into a single
+    preallocated buffer; only newly arrived bytes are scanned for the newline.
+    """
+    buf  = bytearray(max_bytes)
+    view = memoryview(buf)
+    pos  = 0
+    while pos < max_bytes:
+        n = sock.recv_into(view[pos:])
+        if not n:
+            raise ConnectionResetError("DGX closed connection before replying")
+        nl = buf.find(b"\n", pos, pos + n)
+        pos += n
+        if nl >= 0:
+            return json.loads(buf[:nl])
+    raise ValueError(f"DGX reply exceeded {max_bytes} bytes without newline")
 
 
 def _get_local_ip() -> str:
     """
-    Detect the local IP by routing toward 10.0.0.1 (doesn't actually send
-    any data — just asks the OS which interface it would use).
-    Falls back to 10.0.0.2 if detection fails.
+    Detect the PC's address on the direct 10.0.0.x link.
+    1. Ask the OS which interface routes toward 10.0.0.1 (a UDP connect —
+       no data is sent).
+    2. If that is not a link address (no route yet, or the default NIC won
+       on a multi-NIC machine), look through this PC's own addresses.
+       Only on Windows, which answers its own host name from the adapter
+       list; elsewhere that can turn into a slow DNS query.
+    Falls back to the probed address, then 10.0.0.2.
     """
+    probed = ""
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
             s.connect(("10.0.0.1", 80))
-            return s.getsockname()[0]
-    except Exception:
+            probed = s.getsockname()[0]
+    except OSError:
         pass
-    try:
-        return socket.gethostbyname(socket.gethostname())
-    except Exception:
-        return "10.0.0.2"
+    if probed.startswith(_LINK_PREFIX):
+        return probed
+    if sys.platform == "win32":
+        try:
+            for *_, (addr, _port) in socket.getaddrinfo(
+                    socket.gethostname(), None, socket.AF_INET):
+                if addr.startswith(_LINK_PREFIX):
+                    return addr
+        except OSError:
+            pass
+    return probed or "10.0.0.2"
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -65,16 +108,23 @@ class _NegotiateThread(QThread):
     step     = pyqtSignal(str, str)   # (message, level)  level=info/ok/error/warn
     finished = pyqtSignal(bool, dict) # (success, result_dict)
 
-    def __init__(self, dgx_ip: str, pc_ip: str):
+    def __init__(self, dgx_ip: str, pc_ip: str, preferred: tuple = ()):
         super().__init__()
-        self._dgx_ip = dgx_ip
-        self._pc_ip  = pc_ip
+        self._dgx_ip    = dgx_ip
+        self._pc_ip     = pc_ip
+        self._preferred = preferred   # last negotiated ports, tried first
 
     def run(self):
-        from network.port_negotiator import scan_local_free_ports, DISCOVERY_PORT
+        from network.port_negotiator import (
+            scan_local_free_ports, ports_free_locally, request_ports, DISCOVERY_PORT,
+        )
 
-        self.step.emit("Scanning local ports for free candidates…", "info")
-        candidates = scan_local_free_ports(count=3)
+        # Reuse the previous ports when all of them are still free
+        if self._preferred and ports_free_locally(self._preferred):
+            candidates = list(self._preferred)
+        else:
+            self.step.emit("Scanning local ports for free candidates…", "info")
+            candidates = scan_local_free_ports(count=3)
         if len(candidates) < 3:
             self.step.emit("❌  Not enough free ports found (range 22010-22059)", "error")
             self.finished.emit(False, {})
@@ -85,6 +135,7 @@ class _NegotiateThread(QThread):
 
         try:
             sock = socket.create_connection((self._dgx_ip, DISCOVERY_PORT), timeout=6)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         except OSError as e:
             self.step.emit(f"❌  Cannot reach DGX: {e}", "error")
             self.finished.emit(False, {})
@@ -92,20 +143,8 @@ class _NegotiateThread(QThread):
 
         self.step.emit("Connected. Sending port candidates…", "info")
         try:
-            msg = json.dumps({
-                "type":       "negotiate",
-                "candidates": candidates,
-                "pc_ip":      self._pc_ip,
-            }) + "\n"
-            sock.sendall(msg.encode())
             sock.settimeout(8)
-            buf = b""
-            while b"\n" not in buf:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    raise ConnectionResetError("DGX closed connection during negotiation")
-                buf += chunk
-            resp = json.loads(buf.split(b"\n")[0].decode())
+            resp = request_ports(sock, candidates, pc_ip=self._pc_ip)
         except Exception as e:
             self.step.emit(f"❌  Negotiation error: {e}", "error")
             self.finished.emit(False, {})
@@ -125,32 +164,35 @@ class _NegotiateThread(QThread):
         rpc   = resp["rpc"]
         video = resp["video"]
         inp   = resp["input"]
+        push  = resp.get("push", 0)   # absent on older DGX services
         self.step.emit(
             f"✓  Agreed on ports:  RPC {rpc}  ·  Video {video}  ·  Input {inp}", "ok"
         )
 
-        # Quick RPC ping to confirm service is fully up
-        self.step.emit("Verifying connection…", "info")
-        try:
-            ping_sock = socket.create_connection((self._dgx_ip, rpc), timeout=5)
-            ping_sock.sendall((json.dumps({"type": "ping"}) + "\n").encode())
-            ping_sock.settimeout(4)
-            reply_raw = b""
-            while b"\n" not in reply_raw:
-                c = ping_sock.recv(4096)
-                if not c:
-                    break
-                reply_raw += c
-            ping_sock.close()
-            reply = json.loads(reply_raw.split(b"\n")[0]) if reply_raw else {}
-            if reply.get("type") == "pong" or reply.get("ok"):
-                self.step.emit("✓  DGX responding — ready to launch!", "ok")
-            else:
-                self.step.emit("⚠  Connected but ping response unexpected.", "warn")
-        except Exception as e:
-            self.step.emit(f"⚠  Ports agreed, RPC ping failed: {e}", "warn")
-
-        self.finished.emit(True, {"rpc": rpc, "video": video, "input": inp})
+        if resp.get("rpc_ready"):
+            # DGX binds its RPC listener before replying — no second round trip
+            self.step.emit("✓  DGX responding — ready to launch!", "ok")
+        else:
+            # Older services: quick RPC ping to confirm service is fully up
+            self.step.emit("Verifying connection…", "info")
+            try:
+                ping_sock = socket.create_connection((self._dgx_ip, rpc), timeout=5)
+                ping_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                ping_sock.sendall((json.dumps({"type": "ping"}) + "\n").encode())
+                ping_sock.settimeout(4)
+                try:
+                    reply = _recv_json_line(ping_sock)
+                finally:
+                    ping_sock.close()
+                if reply.get("type") == "pong" or reply.get("ok"):
+                    self.step.emit("✓  DGX responding — ready to launch!", "ok")
+                else:
+                    self.step.emit("⚠  Connected but ping response unexpected.", "warn")
+            except Exception as e:
+                self.step.emit(f"⚠  Ports agreed, RPC ping failed: {e}", "warn")
+
+        self.finished.emit(True, {"rpc": rpc, "video": video, "input": inp,
+                                  "push": push})
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -191,26 +233,29 @@ class _WelcomePage(QWizardPage):
         desc.setWordWrap(True)
         l.addWidget(desc)
         l.addWidget(_Divider())
-        for icon, title, sub in [
+        # One grid for the whole checklist: icon in column 0 spanning the
+        # title/subtitle rows, plus an empty 12 px row between items.
+        grid = QGridLayout()
+        grid.setHorizontalSpacing(10)
+        grid.setVerticalSpacing(1)
+        grid.setColumnStretch(1, 1)
+        for i, (icon, title, sub) in enumerate([
             ("📦", "10 GbE NIC installed in PC",                     "Required hardware"),
             ("🔌", "Direct Cat6A or DAC cable connected",             "PC NIC ↔ DGX NIC"),
             ("⚙️",  "PC NIC set to a static IP (e.g. 10.0.0.2/24)",  "No DHCP, no gateway"),
             ("⚙️",  "DGX set to a static IP (e.g. 10.0.0.1/24)",     "Via netplan or nmcli"),
             ("🐧", "DGX service installed",                           "python3 dgx_service.py  (service will be auto-detected)"),
-        ]:
-            row = QHBoxLayout()
-            row.setSpacing(10)
+        ]):
+            r = i * 3
             ico = QLabel(icon)
             ico.setFixedWidth(28)
             ico.setAlignment(Qt.AlignmentFlag.AlignTop)
-            row.addWidget(ico)
-            col = QVBoxLayout()
-            col.setSpacing(1)
-            col.addWidget(_lbl(title, bold=True))
-            col.addWidget(_lbl(sub, dim=True))
-            row.addLayout(col)
-            row.addStretch()
-            l.addLayout(row)
+            grid.addWidget(ico, r, 0, 2, 1)
+            grid.addWidget(_lbl(title, bold=True), r, 1)
+            grid.addWidget(_lbl(sub, dim=True), r + 1, 1)
+            if i:
+                grid.setRowMinimumHeight(r - 1, 12)
+        l.addLayout(grid)
         l.addStretch()
 
 
@@ -281,27 +326,31 @@ class _NetworkPage(QWizardPage):
         root.addWidget(self._progress)
 
         # ── Step log ──────────────────────────────────────────────────
-        self._log_frame = QFrame()
-        self._log_frame.setStyleSheet(
-            f"background: {BG_SURFACE}; border: 1px solid {BORDER}; border-radius: 6px;"
-        )
-        self._log_frame.setMinimumHeight(120)
-        ll = QVBoxLayout(self._log_frame)
-        ll.setContentsMargins(10, 8, 10, 8)
-        ll.setSpacing(3)
-        self._log_layout = ll
-        root.addWidget(self._log_frame)
+        # One read-only text view keeps the last 12 lines; each level has a
+        # prebuilt char format, so logging is an append, not a new widget.
+        self._log_view = QPlainTextEdit()
+        self._log_view.setReadOnly(True)
+        self._log_view.setMaximumBlockCount(12)
+        self._log_view.setProperty("class", "step-log")
+        self._log_view.setMinimumHeight(120)
+        self._log_fmts = {}
+        for level, color in _LOG_COLORS.items():
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+            self._log_fmts[level] = fmt
+        self._log_fmt_default = self._log_fmts["info"]
+        root.addWidget(self._log_view)
 
         # ── Summary label ─────────────────────────────────────────────
         self._ports_lbl = QLabel("")
-        self._ports_lbl.setStyleSheet(
-            f"color: {SUCCESS}; font-size: 12px; font-weight: 600;"
-        )
+        self._ports_lbl.setProperty("class", "ports-summary")
         root.addWidget(self._ports_lbl)
         root.addStretch()
 
-        self.registerField("pc_ip*",  self._f_pc)
-        self.registerField("dgx_ip*", self._f_dgx)
+        # Not mandatory ("*"): QWizard would re-check completeness on every
+        # keystroke.  validatePage() checks both IPs when Next is clicked.
+        self.registerField("pc_ip",  self._f_pc)
+        self.registerField("dgx_ip", self._f_dgx)
 
         # Pre-fill if reconnecting
         if config.pc_ip:
@@ -334,6 +383,8 @@ class _NetworkPage(QWizardPage):
     # ------------------------------------------------------------------
 
     def _start_negotiation(self):
+        if self._thread is not None and self._thread.isRunning():
+            return   # one negotiation at a time — ignore repeat clicks
         pc  = self._f_pc.text().strip()
         dgx = self._f_dgx.text().strip()
         if not _is_valid_ip(pc):
@@ -348,7 +399,11 @@ class _NetworkPage(QWizardPage):
         self._btn_connect.setEnabled(False)
         self._progress.show()
 
-        self._thread = _NegotiateThread(dgx_ip=dgx, pc_ip=pc)
+        c = self.config
+        self._thread = _NegotiateThread(
+            dgx_ip=dgx, pc_ip=pc,
+            preferred=(c.last_rpc_port, c.last_video_port, c.last_input_port),
+        )
         self._thread.step.connect(self._on_step)
         self._thread.finished.connect(self._on_finished)
         self._thread.start()
@@ -357,6 +412,10 @@ class _NetworkPage(QWizardPage):
         self._log(msg, level)
 
     def _on_finished(self, ok: bool, result: dict):
+        # finished is emitted as run()'s last statement, so this wait is
+        # immediate; then the QThread can be released right away.
+        self._thread.wait()
+        self._thread = None
         self._progress.hide()
         self._btn_connect.setEnabled(True)
         if ok:
@@ -376,10 +435,10 @@ class _NetworkPage(QWizardPage):
         pc  = self._f_pc.text().strip()
         dgx = self._f_dgx.text().strip()
         if not _is_valid_ip(pc):
-            self._f_pc.setStyleSheet(f"border: 1px solid {ERROR};")
+            _mark_error(self._f_pc)
             return False
         if not _is_valid_ip(dgx):
-            self._f_dgx.setStyleSheet(f"border: 1px solid {ERROR};")
+            _mark_error(self._f_dgx)
             return False
         self.config.pc_ip  = pc
         self.config.dgx_ip = dgx
@@ -390,6 +449,8 @@ class _NetworkPage(QWizardPage):
             self.config.last_rpc_port   = self._negotiated["rpc"]
             self.config.last_video_port = self._negotiated["video"]
             self.config.last_input_port = self._negotiated["input"]
+            self.config.push_port       = self._negotiated["push"]
+            self.config.last_push_port  = self._negotiated["push"]
         return True
 
     # ------------------------------------------------------------------
@@ -397,23 +458,15 @@ class _NetworkPage(QWizardPage):
     # ------------------------------------------------------------------
 
     def _log(self, msg: str, level: str = "info"):
-        colors = {"info": TEXT_DIM, "ok": SUCCESS, "error": ERROR, "warn": WARNING}
-        lbl = QLabel(msg)
-        lbl.setStyleSheet(
-            f"color: {colors.get(level, TEXT_DIM)}; font-size: 11px;"
-        )
-        lbl.setWordWrap(True)
-        self._log_layout.addWidget(lbl)
-        while self._log_layout.count() > 12:
-            item = self._log_layout.takeAt(0)
-            if item and item.widget():
-                item.widget().deleteLater()
+        cursor = self._log_view.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self._log_view.document().isEmpty():
+            cursor.insertBlock()
+        cursor.insertText(msg, self._log_fmts.get(level, self._log_fmt_default))
+        self._log_view.ensureCursorVisible()
 
     def _clear_log(self):
-        while self._log_layout.count():
-            item = self._log_layout.takeAt(0)
-            if item and item.widget():
-                item.widget().deleteLater()
+        self._log_view.clear()
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -451,12 +504,7 @@ class _PrefsPage(QWizardPage):
         self.config.start_minimized = self._min.isChecked()
         self.config.save()
         if self._shortcut.isChecked():
-            try:
-                sys.path.insert(0, str(Path(__file__).parents[2]))
-                from create_shortcuts import create_windows_shortcut
-                create_windows_shortcut()
-            except Exception:
-                pass
+            _create_shortcut_in_background()
         return True
 
 
@@ -465,16 +513,39 @@ class _PrefsPage(QWizardPage):
 # ──────────────────────────────────────────────────────────────────────
 
 class _Divider(QFrame):
+    # Styled by the app-wide HLine rule
     def __init__(self):
         super().__init__()
         self.setFrameShape(QFrame.Shape.HLine)
-        self.setStyleSheet(f"background: {BORDER}; max-height: 1px;")
 
 
 def _lbl(text: str, bold: bool = False, dim: bool = False) -> QLabel:
     lbl = QLabel(text)
-    s = []
-    if bold: s.append("font-weight: 600;")
-    if dim:  s.append(f"color: {TEXT_DIM}; font-size: 11px;")
-    if s:    lbl.setStyleSheet(" ".join(s))
+    cls = "strong-dim" if bold and dim else "strong" if bold else "dim" if dim else ""
+    if cls:
+        lbl.setProperty("class", cls)
     return lbl
+
+
+def _mark_error(w: QWidget) -> None:
+    """Switch on the error border from the app stylesheet."""
+    w.setProperty("error", True)
+    w.style().polish(w)
+
+
+def _create_shortcut_in_background() -> None:
+    """Create the desktop shortcut on a worker thread so the COM and file
+    work never holds up the wizard.  Fire-and-forget; failures are ignored."""
+    def work():
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()   # COM must be initialised per thread
+        except ImportError:
+            pass
+        try:
+            from create_shortcuts import create_desktop_shortcut
+            create_desktop_shortcut()
+        except Exception:
+            pass
+
+    threading.Thread(target=work, name="CreateShortcut", daemon=True).start()
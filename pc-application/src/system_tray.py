@@ -3,13 +3,31 @@ pc-application/src/system_tray.py
 System tray icon + context menu for DGX Desktop Remote.
 """
 
+from functools import lru_cache
+from pathlib import Path
+
 from PyQt6.QtWidgets import QSystemTrayIcon, QMenu, QApplication
-from PyQt6.QtGui import QIcon, QPixmap, QPainter, QColor, QBrush
+from PyQt6.QtGui import QIcon, QPixmap, QPainter, QColor, QBrush, QImageReader
 from PyQt6.QtCore import Qt, QSize
 
+_ICON_DIR = Path(__file__).parents[2] / "icons"
+
 
+@lru_cache(maxsize=2)
 def _make_tray_icon(connected: bool = False) -> QIcon:
-    """Render a small DGX icon with a status dot."""
+    """
+    DGX icon with a status dot (cached per state).  Loaded from the SVGs in
+    icons/ so Qt rasterises them at the tray's own DPI; painted by hand
+    when the SVG image plugin is missing.
+    """
+    svg = _ICON_DIR / ("tray_on.svg" if connected else "tray_off.svg")
+    if svg.exists() and b"svg" in QImageReader.supportedImageFormats():
+        return QIcon(str(svg))
+    return _paint_tray_icon(connected)
+
+
+def _paint_tray_icon(connected: bool) -> QIcon:
+    """Render the tray icon with QPainter (fallback for _make_tray_icon)."""
     size = 64
     pm = QPixmap(size, size)
     pm.fill(Qt.GlobalColor.transparent)
@@ -45,7 +63,10 @@ class AppSystemTray(QSystemTrayIcon):
     def __init__(self, main_window, parent=None):
         super().__init__(parent)
         self._win = main_window
-        self.setIcon(_make_tray_icon(False))
+        # Only two states exist — render both once, swap on state change
+        self._icon_on  = _make_tray_icon(True)
+        self._icon_off = _make_tray_icon(False)
+        self.setIcon(self._icon_off)
         self.setToolTip("DGX Desktop Remote — Disconnected")
 
         self._menu = QMenu()
@@ -66,7 +87,7 @@ class AppSystemTray(QSystemTrayIcon):
         self.activated.connect(self._on_activate)
 
     def set_connected(self, connected: bool, host: str = ""):
-        self.setIcon(_make_tray_icon(connected))
+        self.setIcon(self._icon_on if connected else self._icon_off)
         if connected:
             self.setToolTip(f"DGX Desktop Remote — {host}")
             self._act_connect.setEnabled(False)
@@ -3,6 +3,10 @@ pc-application/src/theme.py
 Global dark theme stylesheet + palette for the entire PC application.
 """
 
+from functools import lru_cache
+from string import Template
+from typing import Mapping
+
 ACCENT      = "#6C63FF"   # Purple-indigo accent
 ACCENT_DARK = "#534BD4"
 SUCCESS     = "#22D47E"
@@ -20,388 +24,472 @@ TEXT_DIM    = "#7070A0"
 TEXT_MUTED  = "#404060"
 
 
-APP_STYLESHEET = f"""
+# Palette roles substituted into the $NAME placeholders of the QSS templates
+PALETTE_DARK: dict[str, str] = {
+    "ACCENT": ACCENT, "ACCENT_DARK": ACCENT_DARK,
+    "SUCCESS": SUCCESS, "WARNING": WARNING, "ERROR": ERROR, "DIM": DIM,
+    "BG_DEEP": BG_DEEP, "BG_BASE": BG_BASE, "BG_RAISED": BG_RAISED,
+    "BG_SURFACE": BG_SURFACE, "BG_HOVER": BG_HOVER, "BORDER": BORDER,
+    "TEXT_MAIN": TEXT_MAIN, "TEXT_DIM": TEXT_DIM, "TEXT_MUTED": TEXT_MUTED,
+}
+
+
+# Base: window backgrounds, labels, containers, tooltips.
+_BASE_QSS_TEMPLATE = Template(r"""
 /* ===== Base ===================================================== */
-QWidget {{
-    background-color: {BG_BASE};
-    color: {TEXT_MAIN};
+QWidget {
+    background-color: $BG_BASE;
+    color: $TEXT_MAIN;
     font-family: "Segoe UI", "Inter", "Ubuntu", sans-serif;
     font-size: 13px;
     border: none;
     outline: none;
-}}
-QMainWindow {{
-    background-color: {BG_DEEP};
-}}
+}
+QMainWindow {
+    background-color: $BG_DEEP;
+}
 
 /* ===== QLabel =================================================== */
-QLabel {{
+QLabel {
     background: transparent;
-    color: {TEXT_MAIN};
-}}
-QLabel[class="dim"] {{
-    color: {TEXT_DIM};
+    color: $TEXT_MAIN;
+}
+QLabel[class="dim"] {
+    color: $TEXT_DIM;
     font-size: 11px;
-}}
-QLabel[class="heading"] {{
+}
+QLabel[class="heading"] {
     font-size: 16px;
     font-weight: 600;
-    color: {TEXT_MAIN};
-}}
-QLabel[class="subheading"] {{
+    color: $TEXT_MAIN;
+}
+QLabel[class="subheading"] {
     font-size: 12px;
-    color: {TEXT_DIM};
-}}
-QLabel[class="pill-connected"] {{
-    background-color: {SUCCESS}22;
-    color: {SUCCESS};
-    border: 1px solid {SUCCESS}55;
+    color: $TEXT_DIM;
+}
+QLabel[class="pill-connected"] {
+    background-color: ${SUCCESS}22;
+    color: $SUCCESS;
+    border: 1px solid ${SUCCESS}55;
     border-radius: 10px;
     padding: 2px 10px;
     font-size: 11px;
     font-weight: 600;
-}}
-QLabel[class="pill-disconnected"] {{
-    background-color: {ERROR}22;
-    color: {ERROR};
-    border: 1px solid {ERROR}44;
+}
+QLabel[class="pill-disconnected"] {
+    background-color: ${ERROR}22;
+    color: $ERROR;
+    border: 1px solid ${ERROR}44;
     border-radius: 10px;
     padding: 2px 10px;
     font-size: 11px;
     font-weight: 600;
-}}
-QLabel[class="pill-connecting"] {{
-    background-color: {WARNING}22;
-    color: {WARNING};
-    border: 1px solid {WARNING}44;
+}
+QLabel[class="pill-connecting"] {
+    background-color: ${WARNING}22;
+    color: $WARNING;
+    border: 1px solid ${WARNING}44;
     border-radius: 10px;
     padding: 2px 10px;
     font-size: 11px;
     font-weight: 600;
-}}
+}
+
+/* ===== QGroupBox ================================================ */
+QGroupBox {
+    background-color: $BG_RAISED;
+    border: 1px solid $BORDER;
+    border-radius: 8px;
+    margin-top: 20px;
+    padding: 12px 10px 10px 10px;
+    font-weight: 600;
+    color: $TEXT_DIM;
+    font-size: 11px;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    subcontrol-position: top left;
+    padding: 0 6px;
+    background: $BG_RAISED;
+    color: $TEXT_DIM;
+    font-size: 10px;
+    font-weight: 600;
+    letter-spacing: 1px;
+}
 
+/* ===== QStatusBar =============================================== */
+QStatusBar {
+    background-color: $BG_DEEP;
+    color: $TEXT_DIM;
+    font-size: 11px;
+    border-top: 1px solid $BORDER;
+    padding: 2px 8px;
+}
+QStatusBar QLabel {
+    color: $TEXT_DIM;
+    font-size: 11px;
+    padding: 0 6px;
+}
+
+/* ===== QToolBar ================================================= */
+QToolBar {
+    background-color: $BG_RAISED;
+    border-bottom: 1px solid $BORDER;
+    spacing: 4px;
+    padding: 4px 8px;
+}
+QToolBar::separator {
+    background: $BORDER;
+    width: 1px;
+    margin: 4px 6px;
+}
+
+/* ===== QDialog ================================================== */
+QDialog {
+    background-color: $BG_BASE;
+}
+
+/* ===== QWizard ================================================== */
+QWizard {
+    background-color: $BG_BASE;
+}
+QWizardPage {
+    background-color: $BG_BASE;
+}
+
+/* ===== QMessageBox ============================================== */
+QMessageBox {
+    background-color: $BG_BASE;
+}
+QMessageBox QPushButton {
+    min-width: 80px;
+}
+
+/* ===== QFrame separator ========================================= */
+QFrame[frameShape="4"],   /* HLine */
+QFrame[frameShape="5"] { /* VLine */
+    background: $BORDER;
+    border: none;
+    max-height: 1px;
+}
+
+/* ===== QToolTip ================================================= */
+QToolTip {
+    background-color: $BG_RAISED;
+    color: $TEXT_MAIN;
+    border: 1px solid $BORDER;
+    padding: 4px 8px;
+    border-radius: 4px;
+    font-size: 12px;
+}
+""")
+
+# Push buttons and their class variants.
+_BUTTON_QSS_TEMPLATE = Template(r"""
 /* ===== QPushButton ============================================== */
-QPushButton {{
-    background-color: {BG_SURFACE};
-    color: {TEXT_MAIN};
-    border: 1px solid {BORDER};
+QPushButton {
+    background-color: $BG_SURFACE;
+    color: $TEXT_MAIN;
+    border: 1px solid $BORDER;
     border-radius: 6px;
     padding: 6px 16px;
     font-weight: 500;
-}}
-QPushButton:hover {{
-    background-color: {BG_HOVER};
-    border-color: {DIM};
-}}
-QPushButton:pressed {{
-    background-color: {ACCENT_DARK};
-    border-color: {ACCENT};
-}}
-QPushButton:disabled {{
-    color: {TEXT_MUTED};
-    border-color: {TEXT_MUTED};
-}}
-QPushButton[class="primary"] {{
-    background-color: {ACCENT};
+}
+QPushButton:hover {
+    background-color: $BG_HOVER;
+    border-color: $DIM;
+}
+QPushButton:pressed {
+    background-color: $ACCENT_DARK;
+    border-color: $ACCENT;
+}
+QPushButton:disabled {
+    color: $TEXT_MUTED;
+    border-color: $TEXT_MUTED;
+}
+QPushButton[class="primary"] {
+    background-color: $ACCENT;
     color: white;
     border: none;
     font-weight: 600;
-}}
-QPushButton[class="primary"]:hover {{
-    background-color: {ACCENT_DARK};
-}}
-QPushButton[class="primary"]:pressed {{
+}
+QPushButton[class="primary"]:hover {
+    background-color: $ACCENT_DARK;
+}
+QPushButton[class="primary"]:pressed {
     background-color: #3E37A8;
-}}
-QPushButton[class="danger"] {{
+}
+QPushButton[class="danger"] {
     background-color: transparent;
-    color: {ERROR};
-    border: 1px solid {ERROR}55;
-}}
-QPushButton[class="danger"]:hover {{
-    background-color: {ERROR}22;
-}}
-QPushButton[class="success"] {{
-    background-color: {SUCCESS}22;
-    color: {SUCCESS};
-    border: 1px solid {SUCCESS}55;
-}}
-QPushButton[class="toolbar"] {{
+    color: $ERROR;
+    border: 1px solid ${ERROR}55;
+}
+QPushButton[class="danger"]:hover {
+    background-color: ${ERROR}22;
+}
+QPushButton[class="success"] {
+    background-color: ${SUCCESS}22;
+    color: $SUCCESS;
+    border: 1px solid ${SUCCESS}55;
+}
+QPushButton[class="toolbar"] {
     background-color: transparent;
     border: none;
     border-radius: 6px;
     padding: 6px 10px;
-    color: {TEXT_DIM};
+    color: $TEXT_DIM;
     font-size: 18px;
-}}
-QPushButton[class="toolbar"]:hover {{
-    background-color: {BG_HOVER};
-    color: {TEXT_MAIN};
-}}
-QPushButton[class="toolbar"]:checked {{
-    background-color: {ACCENT}33;
-    color: {ACCENT};
-}}
+}
+QPushButton[class="toolbar"]:hover {
+    background-color: $BG_HOVER;
+    color: $TEXT_MAIN;
+}
+QPushButton[class="toolbar"]:checked {
+    background-color: ${ACCENT}33;
+    color: $ACCENT;
+}
+""")
 
+# Text, number, choice and check inputs.
+_INPUT_QSS_TEMPLATE = Template(r"""
 /* ===== QLineEdit ================================================ */
-QLineEdit {{
-    background-color: {BG_SURFACE};
-    border: 1px solid {BORDER};
+QLineEdit {
+    background-color: $BG_SURFACE;
+    border: 1px solid $BORDER;
     border-radius: 6px;
     padding: 7px 10px;
-    color: {TEXT_MAIN};
-    selection-background-color: {ACCENT};
-}}
-QLineEdit:focus {{
-    border-color: {ACCENT};
-}}
-QLineEdit:read-only {{
-    color: {TEXT_DIM};
-}}
+    color: $TEXT_MAIN;
+    selection-background-color: $ACCENT;
+}
+QLineEdit:focus {
+    border-color: $ACCENT;
+}
+QLineEdit:read-only {
+    color: $TEXT_DIM;
+}
 
 /* ===== QSpinBox / QComboBox ===================================== */
-QSpinBox, QDoubleSpinBox {{
-    background-color: {BG_SURFACE};
-    border: 1px solid {BORDER};
+QSpinBox, QDoubleSpinBox {
+    background-color: $BG_SURFACE;
+    border: 1px solid $BORDER;
     border-radius: 6px;
     padding: 6px 10px;
-    color: {TEXT_MAIN};
-    selection-background-color: {ACCENT};
-}}
-QSpinBox:focus, QDoubleSpinBox:focus {{ border-color: {ACCENT}; }}
-QSpinBox::up-button, QSpinBox::down-button {{
-    background: {BG_RAISED};
+    color: $TEXT_MAIN;
+    selection-background-color: $ACCENT;
+}
+QSpinBox:focus, QDoubleSpinBox:focus { border-color: $ACCENT; }
+QSpinBox::up-button, QSpinBox::down-button {
+    background: $BG_RAISED;
     border: none;
     width: 16px;
-}}
-QComboBox {{
-    background-color: {BG_SURFACE};
-    border: 1px solid {BORDER};
+}
+QComboBox {
+    background-color: $BG_SURFACE;
+    border: 1px solid $BORDER;
     border-radius: 6px;
     padding: 6px 10px;
-    color: {TEXT_MAIN};
-}}
-QComboBox:focus {{ border-color: {ACCENT}; }}
-QComboBox::drop-down {{
+    color: $TEXT_MAIN;
+}
+QComboBox:focus { border-color: $ACCENT; }
+QComboBox::drop-down {
     border: none;
     width: 24px;
-}}
-QComboBox QAbstractItemView {{
-    background-color: {BG_RAISED};
-    border: 1px solid {BORDER};
-    color: {TEXT_MAIN};
-    selection-background-color: {ACCENT};
+}
+QComboBox QAbstractItemView {
+    background-color: $BG_RAISED;
+    border: 1px solid $BORDER;
+    color: $TEXT_MAIN;
+    selection-background-color: $ACCENT;
     outline: none;
-}}
+}
 
 /* ===== QCheckBox ================================================ */
-QCheckBox {{
+QCheckBox {
     spacing: 8px;
-    color: {TEXT_MAIN};
-}}
-QCheckBox::indicator {{
+    color: $TEXT_MAIN;
+}
+QCheckBox::indicator {
     width: 16px;
     height: 16px;
     border-radius: 4px;
-    border: 1px solid {BORDER};
-    background: {BG_SURFACE};
-}}
-QCheckBox::indicator:checked {{
-    background-color: {ACCENT};
-    border-color: {ACCENT};
-    image: url("data:image/png;base64,");
-}}
-QCheckBox::indicator:hover {{ border-color: {ACCENT}; }}
+    border: 1px solid $BORDER;
+    background: $BG_SURFACE;
+}
+QCheckBox::indicator:checked {
+    background-color: $ACCENT;
+    border-color: $ACCENT;
+}
+QCheckBox::indicator:hover { border-color: $ACCENT; }
 
-/* ===== QGroupBox ================================================ */
-QGroupBox {{
-    background-color: {BG_RAISED};
-    border: 1px solid {BORDER};
-    border-radius: 8px;
-    margin-top: 20px;
-    padding: 12px 10px 10px 10px;
-    font-weight: 600;
-    color: {TEXT_DIM};
-    font-size: 11px;
-    text-transform: uppercase;
-    letter-spacing: 1px;
-}}
-QGroupBox::title {{
-    subcontrol-origin: margin;
-    subcontrol-position: top left;
-    padding: 0 6px;
-    background: {BG_RAISED};
-    color: {TEXT_DIM};
-    font-size: 10px;
-    font-weight: 600;
-    letter-spacing: 1px;
-}}
+/* ===== QTextEdit ================================================ */
+QTextEdit, QPlainTextEdit {
+    background-color: $BG_SURFACE;
+    border: 1px solid $BORDER;
+    border-radius: 6px;
+    color: $TEXT_MAIN;
+    font-family: "Cascadia Code", "Consolas", "Courier New", monospace;
+    font-size: 12px;
+    padding: 6px;
+    selection-background-color: $ACCENT;
+}
+""")
 
+_TAB_QSS_TEMPLATE = Template(r"""
 /* ===== QTabWidget =============================================== */
-QTabWidget::pane {{
-    background-color: {BG_RAISED};
-    border: 1px solid {BORDER};
+QTabWidget::pane {
+    background-color: $BG_RAISED;
+    border: 1px solid $BORDER;
     border-radius: 8px;
     border-top-left-radius: 0px;
-}}
-QTabBar::tab {{
-    background: {BG_BASE};
-    color: {TEXT_DIM};
+}
+QTabBar::tab {
+    background: $BG_BASE;
+    color: $TEXT_DIM;
     padding: 8px 18px;
-    border: 1px solid {BORDER};
+    border: 1px solid $BORDER;
     border-bottom: none;
     border-top-left-radius: 6px;
     border-top-right-radius: 6px;
     margin-right: 2px;
     font-size: 12px;
-}}
-QTabBar::tab:selected {{
-    background: {BG_RAISED};
-    color: {TEXT_MAIN};
-    border-bottom: 2px solid {ACCENT};
-}}
-QTabBar::tab:hover:!selected {{
-    background: {BG_HOVER};
-    color: {TEXT_MAIN};
-}}
+}
+QTabBar::tab:selected {
+    background: $BG_RAISED;
+    color: $TEXT_MAIN;
+    border-bottom: 2px solid $ACCENT;
+}
+QTabBar::tab:hover:!selected {
+    background: $BG_HOVER;
+    color: $TEXT_MAIN;
+}
+""")
 
+_LIST_QSS_TEMPLATE = Template(r"""
 /* ===== QListWidget ============================================== */
-QListWidget {{
-    background-color: {BG_SURFACE};
-    border: 1px solid {BORDER};
+QListWidget {
+    background-color: $BG_SURFACE;
+    border: 1px solid $BORDER;
     border-radius: 6px;
     padding: 4px;
     outline: none;
-}}
-QListWidget::item {{
+}
+QListWidget::item {
     padding: 6px 8px;
     border-radius: 4px;
-    color: {TEXT_MAIN};
-}}
-QListWidget::item:selected {{
-    background-color: {ACCENT}33;
-    color: {ACCENT};
-}}
-QListWidget::item:hover {{ background-color: {BG_HOVER}; }}
+    color: $TEXT_MAIN;
+}
+QListWidget::item:selected {
+    background-color: ${ACCENT}33;
+    color: $ACCENT;
+}
+QListWidget::item:hover { background-color: $BG_HOVER; }
+""")
 
+_SCROLLBAR_QSS_TEMPLATE = Template(r"""
 /* ===== QScrollBar =============================================== */
-QScrollBar:vertical {{
-    background: {BG_BASE};
+QScrollBar:vertical {
+    background: $BG_BASE;
     width: 8px;
     margin: 0;
     border-radius: 4px;
-}}
-QScrollBar::handle:vertical {{
-    background: {DIM};
+}
+QScrollBar::handle:vertical {
+    background: $DIM;
     border-radius: 4px;
     min-height: 20px;
-}}
-QScrollBar::handle:vertical:hover {{ background: {ACCENT}; }}
-QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{ height: 0; }}
-QScrollBar:horizontal {{
-    background: {BG_BASE};
+}
+QScrollBar::handle:vertical:hover { background: $ACCENT; }
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0; }
+QScrollBar:horizontal {
+    background: $BG_BASE;
     height: 8px;
     border-radius: 4px;
-}}
-QScrollBar::handle:horizontal {{
-    background: {DIM};
+}
+QScrollBar::handle:horizontal {
+    background: $DIM;
     border-radius: 4px;
     min-width: 20px;
-}}
-QScrollBar::handle:horizontal:hover {{ background: {ACCENT}; }}
-QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {{ width: 0; }}
+}
+QScrollBar::handle:horizontal:hover { background: $ACCENT; }
+QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal { width: 0; }
+""")
 
+_PROGRESS_QSS_TEMPLATE = Template(r"""
 /* ===== QProgressBar ============================================= */
-QProgressBar {{
-    background-color: {BG_SURFACE};
-    border: 1px solid {BORDER};
+QProgressBar {
+    background-color: $BG_SURFACE;
+    border: 1px solid $BORDER;
     border-radius: 6px;
     text-align: center;
-    color: {TEXT_MAIN};
+    color: $TEXT_MAIN;
     font-size: 11px;
     height: 16px;
-}}
-QProgressBar::chunk {{
+}
+QProgressBar::chunk {
     background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                                stop:0 {ACCENT}, stop:1 {SUCCESS});
+                                stop:0 $ACCENT, stop:1 $SUCCESS);
     border-radius: 5px;
-}}
+}
+""")
 
-/* ===== QStatusBar =============================================== */
-QStatusBar {{
-    background-color: {BG_DEEP};
-    color: {TEXT_DIM};
+_WIZARD_QSS_TEMPLATE = Template(r"""
+/* ===== Setup wizard ============================================= */
+QLabel[class="strong"] {
+    font-weight: 600;
+}
+QLabel[class="strong-dim"] {
+    font-weight: 600;
+    color: $TEXT_DIM;
     font-size: 11px;
-    border-top: 1px solid {BORDER};
-    padding: 2px 8px;
-}}
-QStatusBar QLabel {{
-    color: {TEXT_DIM};
+}
+QLabel[class="ports-summary"] {
+    color: $SUCCESS;
+    font-size: 12px;
+    font-weight: 600;
+}
+QLineEdit[error="true"] {
+    border: 1px solid $ERROR;
+}
+QPlainTextEdit[class="step-log"] {
+    font-family: "Segoe UI", "Inter", "Ubuntu", sans-serif;
     font-size: 11px;
-    padding: 0 6px;
-}}
+    padding: 6px 8px;
+}
+""")
 
-/* ===== QToolBar ================================================= */
-QToolBar {{
-    background-color: {BG_RAISED};
-    border-bottom: 1px solid {BORDER};
-    spacing: 4px;
-    padding: 4px 8px;
-}}
-QToolBar::separator {{
-    background: {BORDER};
-    width: 1px;
-    margin: 4px 6px;
-}}
+# Whole-application template, the union of the family pieces above
+APP_QSS_TEMPLATE = Template("".join(t.template for t in (
+    _BASE_QSS_TEMPLATE, _BUTTON_QSS_TEMPLATE, _INPUT_QSS_TEMPLATE, _TAB_QSS_TEMPLATE,
+    _LIST_QSS_TEMPLATE, _SCROLLBAR_QSS_TEMPLATE, _PROGRESS_QSS_TEMPLATE,
+    _WIZARD_QSS_TEMPLATE,
+)))
 
-/* ===== QTextEdit ================================================ */
-QTextEdit, QPlainTextEdit {{
-    background-color: {BG_SURFACE};
-    border: 1px solid {BORDER};
-    border-radius: 6px;
-    color: {TEXT_MAIN};
-    font-family: "Cascadia Code", "Consolas", "Courier New", monospace;
-    font-size: 12px;
-    padding: 6px;
-    selection-background-color: {ACCENT};
-}}
 
-/* ===== QDialog ================================================== */
-QDialog {{
-    background-color: {BG_BASE};
-}}
+@lru_cache(maxsize=32)
+def _substitute(template: Template, palette: tuple[tuple[str, str], ...]) -> str:
+    return template.substitute(dict(palette))
 
-/* ===== QWizard ================================================== */
-QWizard {{
-    background-color: {BG_BASE};
-}}
-QWizardPage {{
-    background-color: {BG_BASE};
-}}
 
-/* ===== QMessageBox ============================================== */
-QMessageBox {{
-    background-color: {BG_BASE};
-}}
-QMessageBox QPushButton {{
-    min-width: 80px;
-}}
+def build_stylesheet(palette: Mapping[str, str] = PALETTE_DARK,
+                     template: Template = APP_QSS_TEMPLATE) -> str:
+    """
+    Render a QSS template for a palette. Results are cached, so switching
+    back to a palette returns the identical str Qt has already parsed.
+    """
+    return _substitute(template, tuple(sorted(palette.items())))
 
-/* ===== QFrame separator ========================================= */
-QFrame[frameShape="4"],   /* HLine */
-QFrame[frameShape="5"] {{ /* VLine */
-    background: {BORDER};
-    border: none;
-    max-height: 1px;
-}}
 
-/* ===== QToolTip ================================================= */
-QToolTip {{
-    background-color: {BG_RAISED};
-    color: {TEXT_MAIN};
-    border: 1px solid {BORDER};
-    padding: 4px 8px;
-    border-radius: 4px;
-    font-size: 12px;
-}}
-"""
+APP_STYLESHEET = build_stylesheet()
+
+# UTF-8 form for consumers that take raw bytes (QByteArray, .qss export),
+# encoded once here rather than per call.
+APP_STYLESHEET_BYTES = APP_STYLESHEET.encode("utf-8")
+
+
+@lru_cache(maxsize=1)
+def get_stylesheet() -> str:
+    """Application stylesheet; the same str object on every call."""
+    return APP_STYLESHEET
+
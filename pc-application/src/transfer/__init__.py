@@ -1,15 +1,40 @@
 """
 pc-application/src/transfer/__init__.py
 Transfer sub-package.
+
+Re-exports are resolved lazily (PEP 562) so that importing the package for
+analyze_file does not pull in the Qt worker and panel modules.
 """
-from .file_analyzer   import analyze_file, FileInfo
-from .file_converter  import FileConverter
-from .transfer_worker import TransferWorker, TransferItem
-from .transfer_panel  import TransferPanel
+import importlib
+
+# public name → (submodule, attribute)
+_LAZY = {
+    "analyze_file":   ("file_analyzer",    "analyze_file"),
+    "analyze_files":  ("file_analyzer",    "analyze_files"),
+    "FileInfo":       ("file_analyzer",    "FileInfo"),
+    "FileConverter":  ("file_converter",   "FileConverter"),
+    "TransferWorker": ("transfer_worker",  "TransferWorker"),
+    "TransferItem":   ("transfer_session", "TransferItem"),
+    "TransferPanel":  ("transfer_panel",   "TransferPanel"),
+}
 
 __all__ = [
-    "analyze_file", "FileInfo",
+    "analyze_file", "analyze_files", "FileInfo",
     "FileConverter",
     "TransferWorker", "TransferItem",
     "TransferPanel",
 ]
+
+
+def __getattr__(name: str):
+    try:
+        mod, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module("." + mod, __name__), attr)
+    globals()[name] = value     # cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
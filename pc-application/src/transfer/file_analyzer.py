@@ -4,11 +4,20 @@ Magic-byte file analysis, SHA-256 checksums, CRLF detection.
 """
 
 import hashlib
+import mmap
 import os
-import struct
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Optional
+
+try:
+    import blake3    # optional: multithreaded SIMD hashing of large files
+except ImportError:
+    blake3 = None
 
 # ──────────────────────────────────────────────────────────────────────
 # Magic byte signatures → (mime_type, transfer_note)
@@ -36,7 +45,14 @@ _MAGIC: list[tuple[bytes, str, str]] = [
     (b"MZ",                  "application/exe", "binary"),
 ]
 
-_TEXT_EXTENSIONS = {
+# _MAGIC grouped by first byte (list order kept), so detection is one dict
+# lookup plus a startswith on the one or two signatures sharing that byte.
+_MAGIC_BY_FIRST: dict[int, list[tuple[bytes, str, str]]] = {}
+for _entry in _MAGIC:
+    _MAGIC_BY_FIRST.setdefault(_entry[0][0], []).append(_entry)
+del _entry
+
+_TEXT_EXTENSIONS = frozenset(sys.intern(e.lower()) for e in (
     ".txt", ".py", ".sh", ".bash", ".zsh", ".md", ".rst",
     ".csv", ".tsv", ".json", ".yaml", ".yml", ".toml", ".ini",
     ".cfg", ".conf", ".env", ".log", ".xml", ".html", ".htm",
@@ -48,15 +64,37 @@ _TEXT_EXTENSIONS = {
     ".bat", ".cmd", ".ps1", ".ps1xml", ".psm1", ".psd1",
     # Registry / INF / config formats
     ".reg", ".inf", ".nfo",
-}
+))
 
-_BINARY_EXTENSIONS = {
+_BINARY_EXTENSIONS = frozenset(sys.intern(e.lower()) for e in (
     ".safetensors", ".ckpt", ".pt", ".pth", ".bin",
     ".onnx", ".gguf", ".ggml",
+))
+
+_SCAN_BYTES = 262144        # head read: magic, text sniff and CRLF scan
+_HASH_BLOCK = 1024 * 1024   # readinto block for the rest of the hash
+_MMAP_MIN   = 4 * 1024 * 1024   # hash files at least this big through mmap
+
+# Bytes that count as printable for the text heuristic; deleting them with
+# bytes.translate leaves only the control bytes, counted in C.
+_PRINTABLE = bytes(b for b in range(256) if not (b < 0x09 or 0x0E <= b < 0x20))
+
+# Integrity hash constructors by name; each takes optional initial data.
+# SHA-256 is what the DGX echoes back after a transfer, so it stays the
+# default; the others are for local integrity checks of large files.
+_HASHERS: dict[str, Callable] = {
+    "sha256":  hashlib.sha256,
+    "blake2b": hashlib.blake2b,
 }
+if blake3 is not None:
+    _HASHERS["blake3"] = lambda data=b"": blake3.blake3(
+        data, max_threads=blake3.blake3.AUTO)
+
+# Caller-owned digest cache: (path, size, mtime_ns, algo) → hex digest
+DigestCache = dict[tuple[str, int, int, str], str]
 
 
-@dataclass
+@dataclass(slots=True)
 class FileInfo:
     path:         Path
     name:         str
@@ -64,7 +102,8 @@ class FileInfo:
     mime_type:    str    = "application/octet-stream"
     transfer_hint: str   = "binary"    # "binary" | "text"
     has_crlf:     bool   = False
-    sha256:       str    = ""
+    digest:       str    = ""          # hex digest, algorithm in hash_algo
+    hash_algo:    str    = "sha256"
     is_readable:  bool   = True
     error:        Optional[str] = None
 
@@ -75,96 +114,166 @@ class FileInfo:
         self.size_human = _human_size(self.size)
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def _human_size(n: int) -> str:
-    for unit in ("B", "KB", "MB", "GB"):
-        if n < 1024:
-            return f"{n:,.1f} {unit}" if unit != "B" else f"{n} B"
-        n /= 1024
-    return f"{n:.1f} TB"
+    if n < 1024:
+        return f"{n} B"
+    # Unit index from the bit length: each unit is 10 more bits
+    idx = min((n.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    val = n / (1 << (idx * 10))
+    if idx == len(_SIZE_UNITS) - 1:
+        return f"{val:.1f} TB"
+    return f"{val:,.1f} {_SIZE_UNITS[idx]}"
 
 
-def analyze_file(path: Path, compute_sha256: bool = True) -> FileInfo:
+def analyze_file(path: Path | os.DirEntry, compute_sha256: bool = True,
+                 cache: Optional[DigestCache] = None,
+                 algo: str = "sha256") -> FileInfo:
     """
     Detect MIME type, text/binary hint, CRLF presence, and SHA-256.
-    Fast for large files: reads header once, then streams for sha256.
+    Fast for large files: a single open and one sequential read.
+    When the caller passes a `cache` dict, digests are reused from it while
+    size and mtime are unchanged; a same-size rewrite within the
+    filesystem's mtime granularity is not detected, so only pass one for
+    files that are not being rewritten. `algo` picks another hash from
+    _HASHERS ("blake2b", or "blake3" when the blake3 package is installed).
+    An os.DirEntry from scandir() reuses the stat result it already holds.
     """
-    path = Path(path)
+    entry = None
+    if isinstance(path, os.DirEntry):
+        entry = path
+        path  = Path(entry.path)
+    elif not isinstance(path, Path):
+        path = Path(path)
+    name = path.name
+    try:
+        new_hash = _HASHERS[algo]
+    except KeyError:
+        raise ValueError(f"Unsupported hash algorithm: {algo}") from None
 
-    if not path.exists():
-        return FileInfo(path=path, name=path.name, size=0,
+    # One stat call instead of exists() + is_file() + stat()
+    try:
+        st = entry.stat() if entry is not None else os.stat(path)
+    except FileNotFoundError:
+        return FileInfo(path=path, name=name, size=0,
                         is_readable=False, error="File not found")
-    if not path.is_file():
-        return FileInfo(path=path, name=path.name, size=0,
+    except OSError as e:
+        return FileInfo(path=path, name=name, size=0,
+                        is_readable=False, error=str(e))
+    if not stat.S_ISREG(st.st_mode):
+        return FileInfo(path=path, name=name, size=0,
                         is_readable=False, error="Not a regular file")
 
-    stat = path.stat()
-    size = stat.st_size
+    size = st.st_size
+
+    digest = ""
+    key    = (str(path), size, st.st_mtime_ns, algo)
+    if compute_sha256 and cache is not None and key in cache:
+        digest         = cache[key]
+        compute_sha256 = False
 
-    # Read header for magic detection
+    # One open, one sequential pass: the first read serves magic detection,
+    # the text sniff and the CRLF scan, then hashing continues from there.
+    has_crlf = False
     try:
-        with open(path, "rb") as fh:
-            header = fh.read(16)
+        with open(path, "rb", buffering=0) as fh:
+            head = fh.read(_SCAN_BYTES if compute_sha256 else 16)
+            mime, hint = _classify(head[:16], path, size)
+
+            # CRLF detection (text files only, cap at 256 KB scan)
+            if hint == "text":
+                if not compute_sha256:
+                    head += fh.read(_SCAN_BYTES - len(head))
+                has_crlf = b"\r\n" in head
+
+            # SHA-256 (rest of the file)
+            if compute_sha256:
+                try:
+                    digest = _file_digest(fh, head, size, new_hash)
+                    if cache is not None:
+                        cache[key] = digest
+                except OSError:
+                    digest = ""
     except PermissionError:
-        return FileInfo(path=path, name=path.name, size=size,
+        return FileInfo(path=path, name=name, size=size,
                         is_readable=False, error="Permission denied")
     except OSError as e:
-        return FileInfo(path=path, name=path.name, size=size,
+        return FileInfo(path=path, name=name, size=size,
                         is_readable=False, error=str(e))
 
-    # Magic detection
-    mime  = "application/octet-stream"
-    hint  = "binary"
-    for magic, m, h in _MAGIC:
-        if header.startswith(magic):
-            mime, hint = m, h
-            break
-    else:
-        # Extension-based text detection
-        ext = path.suffix.lower()
-        if ext in _BINARY_EXTENSIONS:
-            mime = "application/octet-stream"
-            hint = "binary"
-        elif ext in _TEXT_EXTENSIONS:
-            mime = "text/plain"
-            hint = "text"
-        elif size > 0 and _looks_like_text(header):
-            mime = "text/plain"
-            hint = "text"
-
-    # CRLF detection (text files only, cap at 256 KB scan)
-    has_crlf = False
-    if hint == "text":
-        try:
-            with open(path, "rb") as fh:
-                chunk = fh.read(262144)
-                has_crlf = b"\r\n" in chunk
-        except OSError:
-            pass
-
-    # SHA-256 (stream full file)
-    digest = ""
-    if compute_sha256:
-        sha = hashlib.sha256()
-        try:
-            with open(path, "rb") as fh:
-                for chunk in iter(lambda: fh.read(65536), b""):
-                    sha.update(chunk)
-            digest = sha.hexdigest()
-        except OSError:
-            digest = ""
-
     return FileInfo(
-        path=path, name=path.name, size=size,
+        path=path, name=name, size=size,
         mime_type=mime, transfer_hint=hint,
-        has_crlf=has_crlf, sha256=digest,
+        has_crlf=has_crlf, digest=digest, hash_algo=algo,
         is_readable=True,
     )
 
 
+def analyze_files(paths: Iterable[Path | os.DirEntry], compute_sha256: bool = True,
+                  max_workers: Optional[int] = None,
+                  algo: str = "sha256",
+                  cache: Optional[DigestCache] = None) -> list[FileInfo]:
+    """
+    analyze_file() over many paths on a thread pool, results in input order.
+    hashlib releases the GIL while hashing and file reads release it too,
+    so files overlap their I/O and hashing.
+    """
+    workers = max_workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(partial(analyze_file, compute_sha256=compute_sha256,
+                                     cache=cache, algo=algo),
+                             paths))
+
+
+def _classify(header: bytes, path: Path, size: int) -> tuple[str, str]:
+    """(mime_type, transfer_hint) from the extension and magic bytes."""
+    # Magic wins over any extension: an ELF named *.bin stays application/elf
+    # (and executable), a misnamed archive is never line-ending converted
+    for magic, m, h in _MAGIC_BY_FIRST.get(header[0], ()) if header else ():
+        if header.startswith(magic):
+            return m, h
+    ext = path.suffix.lower()
+    if ext in _BINARY_EXTENSIONS:
+        # Known binary extension: skip the text sniff
+        return "application/octet-stream", "binary"
+    if ext in _TEXT_EXTENSIONS:
+        return "text/plain", "text"
+    if size > 0 and _looks_like_text(header):
+        return "text/plain", "text"
+    return "application/octet-stream", "binary"
+
+
+def _file_digest(fh, head: bytes, size: int = 0,
+                 new_hash: Callable = hashlib.sha256) -> str:
+    """
+    Digest of `head` plus the rest of the open file, read with readinto
+    into one reusable 1 MiB buffer (what hashlib.file_digest does, but
+    continuing after bytes already read). Large files are mapped instead
+    and hashed in one update() with the kernel paging them in.
+    """
+    if size >= _MMAP_MIN:
+        try:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                return new_hash(mm).hexdigest()
+        except (OSError, ValueError):
+            pass    # not mappable (pipe, some network shares): read it
+
+    sha  = new_hash(head)
+    buf  = bytearray(_HASH_BLOCK)
+    view = memoryview(buf)
+    while n := fh.readinto(buf):
+        sha.update(view[:n])
+    return sha.hexdigest()
+
+
 def _looks_like_text(data: bytes, sample: int = 512) -> bool:
     """Heuristic: <10 % non-printable bytes implies text."""
     data = data[:sample]
     if not data:
         return False
-    non_print = sum(1 for b in data if b < 0x09 or (0x0E <= b < 0x20))
+    non_print = len(data.translate(None, _PRINTABLE))
     return non_print / len(data) < 0.10
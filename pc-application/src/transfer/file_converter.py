@@ -14,129 +14,182 @@ silently lost.  The result is runnable for simple scripts and
 reviewable for complex ones.
 """
 
+import mmap
 import os
 import re
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, TextIO
 
 from .file_analyzer import FileInfo
 
+# Variable references rewritten per line; compiled once here
+_PERCENT_VAR = re.compile(r"%(\w+)%")        # batch   %VAR%      → ${VAR}
+
+# Batch fallback line: %VAR% → ${VAR} and \ → / in one pass
+_BAT_XFORM = re.compile(r"%(\w+)%|\\")
+
+
+def _bat_repl(m: re.Match) -> str:
+    g = m.group(1)
+    return "${" + g + "}" if g else "/"
+
+
+# PowerShell line tail: $env:VAR → $VAR, script-path variables, \ → /
+_PS_XFORM = re.compile(r"\$env:(\w+)|\$PSScriptRoot|\$PSCommandPath|\\")
+_PS_LITERALS = {
+    "$PSScriptRoot":  '$(dirname "$0")',
+    "$PSCommandPath": '"$0"',
+    "\\":             "/",
+}
+
+
+def _ps_repl(m: re.Match) -> str:
+    g = m.group(1)
+    return "$" + g if g else _PS_LITERALS[m.group(0)]
+
+
 # ──────────────────────────────────────────────────────────────────────
 # .bat / .cmd  →  .sh
 # ──────────────────────────────────────────────────────────────────────
 
-def _bat_to_sh(text: str) -> str:
-    """Translate a Windows batch script to a bash script."""
-    out  = ["#!/bin/bash", "# Auto-converted from Windows batch by DGX Bridge", ""]
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
+def _bat_path(arg: str) -> str:
+    return arg.replace("\\", "/").strip('"')
+
+
+def _bat_set(line: str, rest: str) -> str:
+    rest = rest.strip()
+    if "=" in rest:
+        k, v = rest.split("=", 1)
+        v = _PERCENT_VAR.sub(r"${\1}", v)
+        return f"{k.strip()}={_quote(v.strip())}"
+    return "# set " + rest
+
+
+def _bat_echo(line: str, rest: str) -> str:
+    if rest.upper() in ("OFF", "ON"):
+        return "# " + line
+    msg = _PERCENT_VAR.sub(r"${\1}", rest)
+    return f"echo {_quote(msg)}"
+
+
+def _bat_echo_quiet(line: str, rest: str) -> str | None:
+    # only @ECHO OFF / @ECHO ON; anything else takes the fallback
+    return "# " + line if rest.upper() in ("OFF", "ON") else None
+
+
+def _bat_complex(line: str, rest: str) -> str:
+    return "# " + _PERCENT_VAR.sub(r"${\1}", line)
+
+
+# Line handlers keyed by the upper-cased first word, for lines that have
+# arguments ("VERB rest"); each returns the bash line, or None to fall back.
+_BAT_VERBS: dict[str, Callable[[str, str], str | None]] = {
+    "REM":    lambda line, rest: "# " + rest,
+    "ECHO":   _bat_echo,
+    "@ECHO":  _bat_echo_quiet,
+    "SET":    _bat_set,
+    "GOTO":   lambda line, rest: "# GOTO " + rest + "  # unsupported",
+    "CALL":   lambda line, rest: "source " + rest.replace("\\", "/"),
+    "CD":     lambda line, rest: f"cd {_quote(_bat_path(rest))}",
+    "MKDIR":  lambda line, rest: f"mkdir -p {_quote(_bat_path(_rest(line)))}",
+    "MD":     lambda line, rest: f"mkdir -p {_quote(_bat_path(_rest(line)))}",
+    "RMDIR":  lambda line, rest: f"rm -rf {_quote(_bat_path(_rest(line)))}",
+    "RD":     lambda line, rest: f"rm -rf {_quote(_bat_path(_rest(line)))}",
+    "DEL":    lambda line, rest: "rm -f " + _rest(line).replace("\\", "/"),
+    "ERASE":  lambda line, rest: "rm -f " + _rest(line).replace("\\", "/"),
+    "COPY":   lambda line, rest: "cp " + rest.replace("\\", "/"),
+    "XCOPY":  lambda line, rest: "cp -r " + rest.replace("\\", "/") + "  # xcopy",
+    "MOVE":   lambda line, rest: "mv " + _rest(line).replace("\\", "/"),
+    "REN":    lambda line, rest: "mv " + _rest(line).replace("\\", "/"),
+    "TYPE":   lambda line, rest: "cat " + _rest(line).replace("\\", "/"),
+    "START":  lambda line, rest: "( " + rest + " & )",
+    "IF":     _bat_complex,
+    "FOR":    _bat_complex,
+}
+
+# Whole-line commands that take no arguments
+_BAT_BARE: dict[str, str] = {
+    "REM":   "# ",
+    "ECHO.": "echo",
+    "PAUSE": 'read -rp "Press enter to continue..." _',
+    "CD":    "cd ~",
+}
+
+# Complex constructs — comment + preserve
+_BAT_COMPLEX_PREFIXES = ("SETLOCAL", "ENDLOCAL", "SHIFT")
 
-    for raw in text.splitlines():
+
+def _bat_to_sh(lines: Iterable[str], out_fh: TextIO) -> None:
+    """Translate a Windows batch script, given as lines, into *out_fh*."""
+    write = out_fh.write
+    write("#!/bin/bash\n# Auto-converted from Windows batch by DGX Bridge\n\n")
+    # Bound once: the loop below runs per line
+    verb_handler = _BAT_VERBS.get
+    bare_line    = _BAT_BARE.get
+    xform        = _BAT_XFORM.sub
+
+    for raw in _split_lines(lines):
         stripped = raw.strip()
-        upper    = stripped.upper()
 
         if not stripped:
-            out.append(""); continue
+            write("\n"); continue
 
-        # Comments
-        if upper.startswith("REM ") or upper == "REM":
-            out.append("# " + stripped[4:]); continue
+        # Comments and labels
         if stripped.startswith("::"):
-            out.append("# " + stripped[2:]); continue
-
-        # echo
-        if upper in ("@ECHO OFF", "@ECHO ON", "ECHO OFF", "ECHO ON"):
-            out.append("# " + stripped); continue
-        if upper.startswith("ECHO "):
-            msg = re.sub(r"%(\w+)%", r"${\1}", stripped[5:])
-            out.append(f'echo {_quote(msg)}'); continue
-        if upper == "ECHO.":
-            out.append("echo"); continue
-
-        # Pause
-        if upper == "PAUSE":
-            out.append('read -rp "Press enter to continue..." _'); continue
-
-        # SET VAR=VALUE
-        if upper.startswith("SET "):
-            rest = stripped[4:].strip()
-            if "=" in rest:
-                k, v = rest.split("=", 1)
-                v = re.sub(r"%(\w+)%", r"${\1}", v)
-                out.append(f"{k.strip()}={_quote(v.strip())}"); continue
-            out.append("# set " + rest); continue
-
-        # Labels and GOTO
-        if stripped.startswith(":") and not stripped.startswith("::"):
-            out.append(stripped[1:] + "():"); continue
-        if upper.startswith("GOTO "):
-            out.append("# GOTO " + stripped[5:] + "  # unsupported"); continue
-        if upper.startswith("CALL "):
-            out.append("source " + stripped[5:].replace("\\", "/")); continue
-
-        # Navigation
-        if upper.startswith("CD ") or upper == "CD":
-            path = (stripped[3:] if len(stripped) > 3 else "~").replace("\\", "/").strip('"')
-            out.append(f"cd {_quote(path)}"); continue
-        if upper.startswith("MKDIR ") or upper.startswith("MD "):
-            path = _rest(stripped).replace("\\", "/").strip('"')
-            out.append(f"mkdir -p {_quote(path)}"); continue
-        if upper.startswith("RMDIR ") or upper.startswith("RD "):
-            path = _rest(stripped).replace("\\", "/").strip('"')
-            out.append(f"rm -rf {_quote(path)}"); continue
-
-        # File ops
-        if upper.startswith("DEL ") or upper.startswith("ERASE "):
-            out.append("rm -f " + _rest(stripped).replace("\\", "/")); continue
-        if upper.startswith("COPY "):
-            out.append("cp " + stripped[5:].replace("\\", "/")); continue
-        if upper.startswith("XCOPY "):
-            out.append("cp -r " + stripped[6:].replace("\\", "/") + "  # xcopy"); continue
-        if upper.startswith("MOVE ") or upper.startswith("REN "):
-            out.append("mv " + _rest(stripped).replace("\\", "/")); continue
-        if upper.startswith("TYPE "):
-            out.append("cat " + _rest(stripped).replace("\\", "/")); continue
-        if upper.startswith("DIR"):
-            out.append("ls " + stripped[3:].replace("\\", "/").strip()); continue
-        if upper.startswith("START "):
-            out.append("( " + stripped[6:] + " & )"); continue
-
-        # Complex constructs — comment + preserve
-        if upper.startswith(("IF ", "FOR ", "SETLOCAL", "ENDLOCAL", "SHIFT")):
-            out.append("# " + re.sub(r"%(\w+)%", r"${\1}", stripped)); continue
+            write("# " + stripped[2:] + "\n"); continue
+        if stripped.startswith(":"):
+            write(stripped[1:] + "():\n"); continue
+
+        # One dict probe on the first word instead of a prefix ladder
+        verb, sep, rest = stripped.partition(" ")
+        verb = verb.upper()
+        if sep:
+            handler = verb_handler(verb)
+            line    = handler(stripped, rest) if handler else None
+        else:
+            line = bare_line(verb)
+        if line is not None:
+            write(line + "\n"); continue
 
-        # Fallback: %VAR% → ${VAR}, backslash → /
-        conv = re.sub(r"%(\w+)%", r"${\1}", stripped).replace("\\", "/")
-        out.append(conv)
+        # Prefix-only commands (DIR/W, SETLOCAL ENABLEDELAYEDEXPANSION, ...)
+        if verb.startswith("DIR"):
+            write("ls " + stripped[3:].replace("\\", "/").strip() + "\n"); continue
+        if verb.startswith(_BAT_COMPLEX_PREFIXES):
+            write(_bat_complex(stripped, rest) + "\n"); continue
 
-    return "\n".join(out) + "\n"
+        # Fallback: %VAR% → ${VAR}, backslash → /
+        write(xform(_bat_repl, stripped) + "\n")
 
 
 # ──────────────────────────────────────────────────────────────────────
 # .ps1  →  .sh
 # ──────────────────────────────────────────────────────────────────────
 
-def _ps1_to_sh(text: str) -> str:
-    """Translate a PowerShell script to a bash script."""
-    out  = ["#!/bin/bash", "# Auto-converted from PowerShell by DGX Bridge", ""]
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
+def _ps1_to_sh(lines: Iterable[str], out_fh: TextIO) -> None:
+    """Translate a PowerShell script, given as lines, into *out_fh*."""
+    write = out_fh.write
+    write("#!/bin/bash\n# Auto-converted from PowerShell by DGX Bridge\n\n")
+    xform = _PS_XFORM.sub    # bound once for the per-line tail
     in_block = False
 
-    for raw in text.splitlines():
+    for raw in _split_lines(lines):
         stripped = raw.strip()
         if "<#" in stripped:
             in_block = True
         if in_block:
-            out.append("# " + stripped)
+            write("# " + stripped + "\n")
             if "#>" in stripped:
                 in_block = False
             continue
 
         if not stripped:
-            out.append(""); continue
+            write("\n"); continue
         if stripped.startswith("#"):
-            out.append(stripped); continue
+            write(stripped + "\n"); continue
 
         s  = stripped
         su = s.upper()
@@ -166,30 +219,38 @@ def _ps1_to_sh(text: str) -> str:
                 path = s[12:].strip().strip("\"'").replace("\\", "/")
                 s = f"rm -rf {_quote(path)}"
             elif su.startswith(("COPY-ITEM ", "MOVE-ITEM ", "NEW-ITEM ")):
-                out.append("# PS: " + stripped + "  # manual conversion needed"); continue
+                write("# PS: " + stripped + "  # manual conversion needed\n"); continue
             elif su.startswith(("INVOKE-EXPRESSION ", "IEX ")):
                 s = "eval " + s.split(None, 1)[1].strip()
             elif su.startswith(("PARAM(", "PARAM (")):
-                out.append("# " + stripped + "  # params — convert to $1 $2 manually"); continue
+                write("# " + stripped + "  # params — convert to $1 $2 manually\n"); continue
             elif su.startswith("FUNCTION "):
                 name = s.split()[1].rstrip("{").strip()
-                out.append(f"{name}() {{"); continue
+                write(f"{name}() {{\n"); continue
             elif stripped == "}":
-                out.append("}"); continue
-
-        s = re.sub(r"\$env:(\w+)", r"$\1", s)
-        s = s.replace("$PSScriptRoot", '$(dirname "$0")')
-        s = s.replace("$PSCommandPath", '"$0"')
-        s = s.replace("\\", "/")
-        out.append(s)
+                write("}\n"); continue
 
-    return "\n".join(out) + "\n"
+        write(xform(_ps_repl, s) + "\n")
 
 
 # ──────────────────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────────────────
 
+def _split_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Lines of a script read with newline="" (CRLF, CR and LF endings kept),
+    split exactly as str.splitlines() would split the whole text.
+    """
+    for line in lines:
+        yield from line.splitlines()
+
+
+def _open_script(path: Path):
+    """Open a script for streaming translation; the file object yields lines."""
+    return open(path, encoding="utf-8", errors="replace", newline="")
+
+
 def _quote(s: str) -> str:
     """Wrap in double-quotes if the string contains spaces."""
     if " " in s or not s:
@@ -202,6 +263,60 @@ def _rest(line: str) -> str:
     return parts[1] if len(parts) > 1 else ""
 
 
+_CRLF_CHUNK = 1 << 20
+_O_BINARY   = getattr(os, "O_BINARY", 0)    # Windows: no newline translation
+
+
+def _copy_strip_crlf(src: Path, dst_fd: int) -> None:
+    """
+    Copy *src* to the raw fd *dst_fd* with CRLF → LF, using os.read/os.write
+    in 1 MiB chunks. Chunks without a CR are written as read; a CR at the
+    end of a chunk is held back so a pair split across chunks still joins.
+    """
+    src_fd = os.open(src, os.O_RDONLY | _O_BINARY)
+    try:
+        carry = b""
+        while buf := os.read(src_fd, _CRLF_CHUNK):
+            if carry:
+                buf, carry = carry + buf, b""
+            if buf.endswith(b"\r"):
+                buf, carry = buf[:-1], b"\r"
+            if b"\r" in buf:
+                buf = buf.replace(b"\r\n", b"\n")
+            _write_all(dst_fd, buf)
+        _write_all(dst_fd, carry)
+    finally:
+        os.close(src_fd)
+
+
+def _has_crlf_fast(path: Path) -> bool:
+    """
+    Confirm a CRLF is really in the file with one mmap find(), which stops
+    at the first hit.
+    """
+    try:
+        with open(path, "rb") as fh, \
+                mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(b"\r\n") != -1
+    except ValueError:      # empty file: nothing to map
+        return False
+    except OSError:
+        return True         # can't check; let the strip itself try
+
+
+def _wants_crlf_strip(info: FileInfo, convert_crlf: bool) -> bool:
+    # has_crlf comes from an earlier analysis; recheck the file so a stale
+    # flag doesn't cost a temp-file copy
+    return (convert_crlf and info.transfer_hint == "text" and info.has_crlf
+            and _has_crlf_fast(info.path))
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
 # Which extensions get converted and to what
 _SCRIPT_CONVERTERS: dict[str, tuple] = {
     ".bat":  (_bat_to_sh, ".sh"),
@@ -261,19 +376,18 @@ class FileConverter:
             converter_fn, new_ext = _SCRIPT_CONVERTERS[ext]
             new_name = info.path.stem + new_ext
             try:
-                src_text  = info.path.read_text(encoding="utf-8", errors="replace")
-                converted = converter_fn(src_text)
-                fd, tmp   = tempfile.mkstemp(suffix=new_ext, prefix="dgx_tx_")
-                tmp_path  = Path(tmp)
-                self._tmp_files.append(tmp_path)
-                with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as fh:
-                    fh.write(converted)
+                with _open_script(info.path) as src:
+                    fd, tmp  = tempfile.mkstemp(suffix=new_ext, prefix="dgx_tx_")
+                    tmp_path = Path(tmp)
+                    self._tmp_files.append(tmp_path)
+                    with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as fh:
+                        converter_fn(src, fh)
                 return tmp_path, new_name, True
             except Exception:
                 pass  # fall through
 
         # ── CRLF strip for plain text ─────────────────────────────────
-        if convert_crlf and info.transfer_hint == "text" and info.has_crlf:
+        if _wants_crlf_strip(info, convert_crlf):
             tmp_path, ok = self._strip_crlf(info.path)
             if ok:
                 return tmp_path, info.name, True
@@ -294,13 +408,12 @@ class FileConverter:
         if not info.is_readable:
             return info.path, info.name
 
-        ext = info.path.suffix.lower()
+        ext        = info.path.suffix.lower()
+        strip_crlf = _wants_crlf_strip(info, convert_crlf)
 
         # Fast path for non-converted binaries (e.g. .safetensors, checkpoints):
         # send the original file directly to avoid huge local copy time/disk usage.
-        if ext not in _SCRIPT_CONVERTERS and not (
-            convert_crlf and info.transfer_hint == "text" and info.has_crlf
-        ):
+        if ext not in _SCRIPT_CONVERTERS and not strip_crlf:
             return info.path, info.name
 
         out_dir.mkdir(parents=True, exist_ok=True)
@@ -310,28 +423,66 @@ class FileConverter:
             new_name  = info.path.stem + new_ext
             out_path  = out_dir / new_name
             try:
-                src_text  = info.path.read_text(encoding="utf-8", errors="replace")
-                converted = converter_fn(src_text)
-                out_path.write_text(converted, encoding="utf-8", newline="\n")
+                with _open_script(info.path) as src, \
+                        open(out_path, "w", encoding="utf-8", newline="\n") as fh:
+                    converter_fn(src, fh)
                 return out_path, new_name
             except Exception:
                 pass
 
-        if convert_crlf and info.transfer_hint == "text" and info.has_crlf:
+        if strip_crlf:
             out_path = out_dir / info.name
             try:
-                with open(info.path, "rb") as src, open(out_path, "wb") as dst:
-                    for chunk in iter(lambda: src.read(65536), b""):
-                        dst.write(chunk.replace(b"\r\n", b"\n"))
+                fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o666)
+                try:
+                    _copy_strip_crlf(info.path, fd)
+                finally:
+                    os.close(fd)
                 return out_path, info.name
             except OSError:
                 pass
 
-        # No conversion — copy as-is
+        # No conversion — copy as-is. copyfile copies in the kernel
+        # (sendfile / copy_file_range); timestamps are best effort.
         out_path = out_dir / info.name
-        shutil.copy2(info.path, out_path)
+        shutil.copyfile(info.path, out_path)
+        try:
+            shutil.copystat(info.path, out_path)
+        except OSError:
+            pass
         return out_path, info.name
 
+    def prepare_many(
+        self,
+        infos: Iterable[FileInfo],
+        out_dir: Path,
+        convert_crlf: bool = True,
+        workers: Optional[int] = None,
+    ) -> list[tuple[Path, str]]:
+        """
+        :meth:`prepare_to_dir` for many files on a thread pool, results in
+        input order.  Reads, CRLF copies and in-kernel copies overlap.
+        Files that could land on the same name in *out_dir* (same stem,
+        compared case-insensitively, since a.bat and a.cmd both become
+        a.sh) are prepared one after another in input order, so the last
+        one wins as in a serial loop instead of interleaving writes.
+        """
+        infos   = list(infos)
+        results: list[Optional[tuple[Path, str]]] = [None] * len(infos)
+        groups: dict[str, list[int]] = {}
+        for i, info in enumerate(infos):
+            groups.setdefault(info.path.stem.casefold(), []).append(i)
+
+        def _run(indices: list[int]) -> None:
+            for i in indices:
+                results[i] = self.prepare_to_dir(infos[i], out_dir, convert_crlf)
+
+        workers = workers or min(32, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(_run, groups.values()):
+                pass
+        return results
+
     # ── Private ───────────────────────────────────────────────────────
 
     def _strip_crlf(self, path: Path) -> tuple[Path, bool]:
@@ -339,9 +490,10 @@ class FileConverter:
             fd, tmp  = tempfile.mkstemp(suffix=path.suffix, prefix="dgx_tx_")
             tmp_path = Path(tmp)
             self._tmp_files.append(tmp_path)
-            with open(path, "rb") as src, open(fd, "wb") as dst:
-                for chunk in iter(lambda: src.read(65536), b""):
-                    dst.write(chunk.replace(b"\r\n", b"\n"))
+            try:
+                _copy_strip_crlf(path, fd)
+            finally:
+                os.close(fd)
             return tmp_path, True
         except OSError:
             return path, False
@@ -358,23 +510,36 @@ class FileConverter:
     def get_remote_metadata(self, info: FileInfo, dgx_name: str = "") -> dict:
         """Build the metadata dict sent alongside each file to the DGX."""
         name = dgx_name or info.name
-        return {
+        ext  = info.path.suffix.lower()
+        meta = {
             "name":        name,
             "size":        info.size,
-            "sha256":      info.sha256,
             "mime_type":   info.mime_type,
             "is_text":     info.transfer_hint == "text",
             "had_crlf":    info.has_crlf,
-            "converted":   info.path.suffix.lower() in _SCRIPT_CONVERTERS,
-            "permissions": _suggest_permissions(info, name),
+            "converted":   ext in _SCRIPT_CONVERTERS,
+            # unrenamed files share the source suffix; skip re-deriving it
+            "permissions": _suggest_permissions(info, name, ext if name == info.name else None),
         }
+        # The DGX verifies this field as SHA-256; other digests stay local
+        if info.hash_algo == "sha256":
+            meta["sha256"] = info.digest
+        return meta
+
 
+_EXEC_SUFFIXES = frozenset((".sh", ".bash", ".zsh", ".py", ".pl", ".rb"))
 
-def _suggest_permissions(info: FileInfo, dgx_name: str = "") -> str:
+
+def _suggest_permissions(info: FileInfo, dgx_name: str = "",
+                         suffix: Optional[str] = None) -> str:
     """Return chmod octal string based on file type."""
-    name   = dgx_name or info.name
-    suffix = Path(name).suffix.lower()
-    if info.mime_type in ("application/elf", "application/exe") \
-            or suffix in (".sh", ".bash", ".zsh", ".py", ".pl", ".rb"):
+    if suffix is None:
+        suffix = Path(dgx_name or info.name).suffix.lower()
+    return _perm_for(info.mime_type, suffix)
+
+
+@lru_cache(maxsize=256)
+def _perm_for(mime: str, suffix: str) -> str:
+    if mime in ("application/elf", "application/exe") or suffix in _EXEC_SUFFIXES:
         return "0755"
     return "0644"
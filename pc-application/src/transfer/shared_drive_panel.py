@@ -16,86 +16,137 @@ from __future__ import annotations
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from PyQt6.QtCore import (
-    QThread, Qt, QTimer, pyqtSignal, pyqtSlot,
+    QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, pyqtSlot,
 )
 from PyQt6.QtWidgets import (
     QFileDialog, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
-    QPushButton, QSizePolicy, QVBoxLayout, QWidget, QProgressBar,
+    QPushButton, QVBoxLayout, QWidget, QProgressBar,
     QMessageBox,
 )
 
 from theme import (
     ACCENT, BG_BASE, BG_RAISED, BG_SURFACE, BORDER,
-    ERROR, SUCCESS, TEXT_DIM, TEXT_MAIN, WARNING,
+    ERROR, TEXT_DIM, TEXT_MAIN,
 )
 
+from .transfer_session import sha256_file
+
 log = logging.getLogger("pc.shared_drive")
 
 _DOWNLOADS_DIR = Path.home() / "Downloads"
 
+# Minimum spacing between progress signals from a worker thread; the final
+# byte is always reported.
+_PROGRESS_INTERVAL = 0.05
+
 
 # ──────────────────────────────────────────────────────────────────────
 # Background workers
 # ──────────────────────────────────────────────────────────────────────
 
-class _ListThread(QThread):
-    result = pyqtSignal(dict)
+class _TransferSignals(QObject):
+    """Signal holder for the pool tasks; lives on the GUI thread."""
+    result         = pyqtSignal(dict)             # list_shared reply
+    file_done      = pyqtSignal(str, bool, str)   # filename, ok, error
+    file_progress  = pyqtSignal(str, int, int)    # filename, done, total
+    batch_progress = pyqtSignal(int, int)         # done_bytes, total_bytes (all files)
+    all_done       = pyqtSignal()
+    progress       = pyqtSignal(int, int)         # download done_bytes, total_bytes
+    done           = pyqtSignal(dict)             # download result dict
+
 
-    def __init__(self, conn):
+class _ListTask(QRunnable):
+    def __init__(self, conn, signals: _TransferSignals):
         super().__init__()
-        self._conn = conn
+        self._conn    = conn
+        self._signals = signals
 
     def run(self):
         try:
             r = self._conn.rpc({"type": "list_shared"}, timeout=10)
-            self.result.emit(r)
+            if r.get("ok"):
+                # Row text is formatted here, off the GUI thread
+                r["labels"] = [_file_label(info) for info in r.get("files", [])]
+            self._signals.result.emit(r)
         except Exception as exc:
-            self.result.emit({"ok": False, "error": str(exc)})
+            self._signals.result.emit({"ok": False, "error": str(exc)})
 
 
-class _UploadThread(QThread):
-    file_done     = pyqtSignal(str, bool, str)   # filename, ok, error
-    file_progress = pyqtSignal(str, int, int)     # filename, done, total
-    all_done      = pyqtSignal()
+class _UploadTask(QRunnable):
+    """
+    Uploads files one at a time, in order — every send_file holds the
+    connection's RPC lock, so more in flight would not move bytes faster.
+    The next file's SHA-256 is computed while the current one is sending.
+    """
 
-    def __init__(self, conn, paths: list[str]):
+    def __init__(self, conn, paths: list[str], signals: _TransferSignals):
         super().__init__()
-        self._conn  = conn
-        self._paths = paths
+        self._conn    = conn
+        self._signals = signals
+        self._paths   = paths
+        self._last_emit   = 0.0
+        self._batch_base  = 0   # bytes of files already finished
+        self._batch_total = 0
 
     def run(self):
+        sizes = []
         for path_str in self._paths:
-            p = Path(path_str)
             try:
-                result = self._conn.send_file(
-                    local_path    = path_str,
-                    remote_folder = "SharedDrive",
-                    progress_cb   = lambda done, total, fn=p.name: (
-                        self.file_progress.emit(fn, done, total)
-                    ),
-                )
-                ok  = result.get("ok", False)
-                err = result.get("error", "") if not ok else ""
-                self.file_done.emit(p.name, ok, err)
-            except Exception as exc:
-                self.file_done.emit(p.name, False, str(exc))
-        self.all_done.emit()
-
-
-class _DownloadThread(QThread):
-    progress = pyqtSignal(int, int)   # done_bytes, total_bytes
-    done     = pyqtSignal(dict)       # result dict
-
-    def __init__(self, conn, filename: str, local_path: str):
+                sizes.append(os.path.getsize(path_str))
+            except OSError:
+                sizes.append(0)
+        self._batch_total = sum(sizes)
+
+        with ThreadPoolExecutor(max_workers=1,
+                                thread_name_prefix="SharedUploadHash") as hasher:
+            pending = (hasher.submit(sha256_file, Path(self._paths[0]))
+                       if self._paths else None)
+            for i, path_str in enumerate(self._paths):
+                digest = pending
+                pending = (hasher.submit(sha256_file, Path(self._paths[i + 1]))
+                           if i + 1 < len(self._paths) else None)
+                name = Path(path_str).name
+                try:
+                    result = self._conn.send_file(
+                        local_path    = path_str,
+                        remote_folder = "SharedDrive",
+                        progress_cb   = lambda done, total, fn=name: (
+                            self._report(fn, done, total)
+                        ),
+                        local_sha256  = digest,
+                    )
+                    ok  = result.get("ok", False)
+                    err = result.get("error", "") if not ok else ""
+                    self._signals.file_done.emit(name, ok, err)
+                except Exception as exc:
+                    self._signals.file_done.emit(name, False, str(exc))
+                self._batch_base += sizes[i]
+        self._signals.all_done.emit()
+
+    def _report(self, filename: str, done: int, total: int):
+        now = time.monotonic()
+        if done >= total or now - self._last_emit >= _PROGRESS_INTERVAL:
+            self._last_emit = now
+            self._signals.file_progress.emit(filename, done, total)
+            self._signals.batch_progress.emit(self._batch_base + done,
+                                              self._batch_total)
+
+
+class _DownloadTask(QRunnable):
+    def __init__(self, conn, filename: str, local_path: str,
+                 signals: _TransferSignals):
         super().__init__()
         self._conn       = conn
+        self._signals    = signals
         self._filename   = filename
         self._local_path = local_path
+        self._last_emit  = 0.0
 
     def run(self):
         try:
@@ -103,30 +154,36 @@ class _DownloadThread(QThread):
                 filename   = self._filename,
                 folder     = "SharedDrive",
                 local_dest = self._local_path,
-                progress_cb= lambda done, total: self.progress.emit(done, total),
+                progress_cb= self._report,
             )
-            self.done.emit(result)
+            self._signals.done.emit(result)
         except Exception as exc:
-            self.done.emit({"ok": False, "error": str(exc)})
+            self._signals.done.emit({"ok": False, "error": str(exc)})
+
+    def _report(self, done: int, total: int):
+        now = time.monotonic()
+        if done >= total or now - self._last_emit >= _PROGRESS_INTERVAL:
+            self._last_emit = now
+            self._signals.progress.emit(done, total)
 
 
 # ──────────────────────────────────────────────────────────────────────
 # File row widget
 # ──────────────────────────────────────────────────────────────────────
 
+def _file_label(info: dict) -> str:
+    name  = info.get("name", "?")
+    human = info.get("size_human", "")
+    mtime = info.get("mtime", 0)
+    dt    = datetime.fromtimestamp(mtime).strftime("%b %d, %H:%M") if mtime else ""
+    return f"  {name}   ({human})   {dt}"
+
+
 class _FileItem(QListWidgetItem):
-    def __init__(self, info: dict):
-        super().__init__()
+    def __init__(self, info: dict, label: Optional[str] = None):
+        super().__init__(label if label is not None else _file_label(info))
         self.info = info
-        self._refresh_text()
-
-    def _refresh_text(self):
-        name  = self.info.get("name", "?")
-        human = self.info.get("size_human", "")
-        mtime = self.info.get("mtime", 0)
-        dt    = datetime.fromtimestamp(mtime).strftime("%b %d, %H:%M") if mtime else ""
-        self.setText(f"  {name}   ({human})   {dt}")
-        self.setToolTip(name)
+        self.setToolTip(info.get("name", "?"))
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -143,9 +200,17 @@ class SharedDrivePanel(QWidget):
         super().__init__(parent)
         self._conn: Optional[object] = connection
         self._files: list[dict] = []
-        self._list_thread:     Optional[_ListThread]     = None
-        self._upload_thread:   Optional[_UploadThread]   = None
-        self._download_thread: Optional[_DownloadThread] = None
+        # Workers run on the global QThreadPool and report through one
+        # signal holder, connected once here.
+        self._pool    = QThreadPool.globalInstance()
+        self._signals = _TransferSignals(self)
+        self._signals.result.connect(self._on_list_result)
+        self._signals.file_progress.connect(self._on_upload_progress)
+        self._signals.batch_progress.connect(self._on_upload_batch_progress)
+        self._signals.file_done.connect(self._on_file_uploaded)
+        self._signals.all_done.connect(self._on_upload_all_done)
+        self._signals.progress.connect(self._on_download_progress)
+        self._signals.done.connect(self._on_download_done)
         self._transfer_panel   = None   # wired by MainWindow
         self._pending_dl_name  = ""     # filename being downloaded
         self._pending_dl_dest  = ""     # local destination path
@@ -303,6 +368,12 @@ class SharedDrivePanel(QWidget):
         self._btn_refresh.setEnabled(enabled)
         self._btn_open_dgx.setEnabled(enabled)
 
+    def _set_percent(self, done: int, total: int):
+        if total > 0:
+            pct = int(done * 100 / total)
+            if pct != self._progress.value():
+                self._progress.setValue(pct)
+
     # ------------------------------------------------------------------
     # Drag-and-drop (drop files onto panel to upload)
     # ------------------------------------------------------------------
@@ -332,9 +403,7 @@ class SharedDrivePanel(QWidget):
             return
         self._status_lbl.setText("Loading…")
         self._btn_refresh.setEnabled(False)
-        self._list_thread = _ListThread(self._conn)
-        self._list_thread.result.connect(self._on_list_result)
-        self._list_thread.start()
+        self._pool.start(_ListTask(self._conn, self._signals))
 
     @pyqtSlot(dict)
     def _on_list_result(self, result: dict):
@@ -350,9 +419,20 @@ class SharedDrivePanel(QWidget):
             return
 
         self._files = result.get("files", [])
-        self._list.clear()
-        for info in self._files:
-            self._list.addItem(_FileItem(info))
+        labels = result.get("labels") or [None] * len(self._files)
+        items  = [_FileItem(info, label) for info, label in zip(self._files, labels)]
+        # One relayout for the whole batch instead of one per addItem
+        lst = self._list
+        lst.setUpdatesEnabled(False)
+        lst.blockSignals(True)
+        try:
+            lst.clear()
+            add = lst.addItem
+            for item in items:
+                add(item)
+        finally:
+            lst.blockSignals(False)
+            lst.setUpdatesEnabled(True)
 
         count = len(self._files)
         total = sum(f.get("size", 0) for f in self._files)
@@ -382,18 +462,16 @@ class SharedDrivePanel(QWidget):
         self._progress.setVisible(True)
         self._progress.setValue(0)
         self._status_lbl.setText(f"Uploading {len(paths)} file(s)…")
-        self._upload_thread = _UploadThread(self._conn, paths)
-        self._upload_thread.file_progress.connect(self._on_upload_progress)
-        self._upload_thread.file_done.connect(self._on_file_uploaded)
-        self._upload_thread.all_done.connect(self._on_upload_all_done)
-        self._upload_thread.start()
+        self._pool.start(_UploadTask(self._conn, paths, self._signals))
 
     @pyqtSlot(str, int, int)
     def _on_upload_progress(self, filename: str, done: int, total: int):
-        if total > 0:
-            self._progress.setValue(int(done * 100 / total))
         self._status_lbl.setText(f"Uploading {filename}…  {_human(done)} / {_human(total)}")
 
+    @pyqtSlot(int, int)
+    def _on_upload_batch_progress(self, done: int, total: int):
+        self._set_percent(done, total)
+
     @pyqtSlot(str, bool, str)
     def _on_file_uploaded(self, filename: str, ok: bool, error: str):
         if not ok:
@@ -430,15 +508,12 @@ class SharedDrivePanel(QWidget):
         self._status_lbl.setText(f"Downloading {filename}…")
         self._pending_dl_name = filename
         self._pending_dl_dest = dest
-        self._download_thread = _DownloadThread(self._conn, filename, dest)
-        self._download_thread.progress.connect(self._on_download_progress)
-        self._download_thread.done.connect(self._on_download_done)
-        self._download_thread.start()
+        self._pool.start(
+            _DownloadTask(self._conn, filename, dest, self._signals))
 
     @pyqtSlot(int, int)
     def _on_download_progress(self, done: int, total: int):
-        if total > 0:
-            self._progress.setValue(int(done * 100 / total))
+        self._set_percent(done, total)
         self._status_lbl.setText(f"Downloading…  {_human(done)} / {_human(total)}")
 
     @pyqtSlot(dict)
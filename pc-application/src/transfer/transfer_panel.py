@@ -73,7 +73,7 @@ from PyQt6.QtWidgets import (
 
 from theme import (
     ACCENT, BG_BASE, BG_DEEP, BG_RAISED, BG_SURFACE,
-    BORDER, SUCCESS, TEXT_DIM, TEXT_MAIN,
+    BORDER, TEXT_DIM, TEXT_MAIN,
 )
 from .transfer_session import TransferSession
 from .transfer_worker import TransferWorker
@@ -243,12 +243,14 @@ def _dgx_dest_for(local: Path, dgx_dir: str) -> str:
 
 
 def sha256_file(path: Path) -> str:
-    """Compute SHA-256 of a local file."""
-    h = hashlib.sha256()
+    """Compute SHA-256 of a local file, reading into one reusable buffer."""
+    h    = hashlib.sha256()
+    buf  = bytearray(1 << 20)
+    view = memoryview(buf)
     try:
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(1 << 20), b""):
-                h.update(chunk)
+        with open(path, "rb", buffering=0) as f:
+            while n := f.readinto(buf):
+                h.update(view[:n])
         return h.hexdigest()
     except OSError:
         return ""
@@ -21,7 +21,6 @@ Signals emitted on the GUI thread via Qt's queued connection.
 import logging
 import time
 from pathlib import Path
-from typing import Optional
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
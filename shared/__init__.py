@@ -1,5 +1,5 @@
 """
 shared/__init__.py
 """
-from .protocol import send_json, recv_line, recv_exact, CHUNK_SIZE
-__all__ = ["send_json", "recv_line", "recv_exact", "CHUNK_SIZE"]
+from .protocol import encode_json, decode_json, send_json, recv_line, recv_exact, CHUNK_SIZE
+__all__ = ["encode_json", "decode_json", "send_json", "recv_line", "recv_exact", "CHUNK_SIZE"]
@@ -8,26 +8,45 @@ import json
 
 CHUNK_SIZE = 65536   # 64 KB — optimal for TCP on 10 GbE
 
+_decoder = json.JSONDecoder()
+
+
+def encode_json(obj: dict) -> bytes:
+    """Serialize dict → compact JSON line (UTF-8, trailing newline)."""
+    return (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def decode_json(raw: bytes) -> dict:
+    """
+    Parse one received JSON line.  Lines are always UTF-8, so this skips
+    json.loads' encoding detection and goes straight to the C scanner.
+    """
+    return _decoder.decode(raw.decode("utf-8"))
+
 
 def send_json(conn: socket.socket, obj: dict) -> None:
     """Serialize dict → JSON + newline and send atomically."""
-    conn.sendall((json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8"))
+    conn.sendall(encode_json(obj))
 
 
 def recv_line(conn: socket.socket, max_bytes: int = 65536) -> bytes:
     """
     Read bytes from socket until '\n' found.
+    Peeks before consuming, so bytes after the newline (e.g. a binary
+    payload following a JSON header) are left in the socket.
     Raises ConnectionError on disconnect, ValueError on oversized line.
     """
-    buf = b""
-    while b"\n" not in buf:
+    buf = bytearray()
+    while True:
         if len(buf) >= max_bytes:
             raise ValueError(f"recv_line exceeded {max_bytes} bytes without newline")
-        chunk = conn.recv(4096)
+        chunk = conn.recv(4096, socket.MSG_PEEK)
         if not chunk:
             raise ConnectionError("Remote end disconnected")
-        buf += chunk
-    return buf.split(b"\n")[0]
+        nl = chunk.find(b"\n")
+        buf += recv_exact(conn, nl + 1 if nl >= 0 else len(chunk))
+        if nl >= 0:
+            return bytes(buf[:-1])
 
 
 def recv_exact(conn: socket.socket, n: int) -> bytes:
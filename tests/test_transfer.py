@@ -7,6 +7,7 @@ Run from the repo root:
 
 from __future__ import annotations
 
+import hashlib
 import os
 import sys
 import tempfile
@@ -19,7 +20,8 @@ _SRC = Path(__file__).parents[1] / "pc-application" / "src"
 if str(_SRC) not in sys.path:
     sys.path.insert(0, str(_SRC))
 
-from transfer.file_analyzer import FileInfo, analyze_file
+from transfer.file_analyzer import FileInfo, analyze_file, analyze_files
+from transfer import file_converter
 from transfer.file_converter import FileConverter
 from transfer.transfer_session import TransferItem, TransferSession
 
@@ -66,6 +68,13 @@ class TestFileAnalyzer:
         info = analyze_file(p)
         assert info.transfer_hint == "binary"
 
+    def test_magic_beats_binary_extension(self, tmp_path: Path) -> None:
+        p = tmp_path / "tool.bin"
+        p.write_bytes(b"\x7fELF" + bytes(60))
+        info = analyze_file(p)
+        assert info.mime_type == "application/elf"
+        assert file_converter._suggest_permissions(info) == "0755"
+
     def test_svg_is_text(self, tmp_path: Path) -> None:
         p = _write(tmp_path, "icon.svg", "<svg></svg>\n")
         info = analyze_file(p)
@@ -76,6 +85,65 @@ class TestFileAnalyzer:
         info = analyze_file(p)
         assert info.transfer_hint == "text"
 
+    def test_unknown_extension_sniffed(self, tmp_path: Path) -> None:
+        text = tmp_path / "notes.xyz"
+        text.write_bytes(b"plain words\twith tabs\n" * 4)
+        ctrl = tmp_path / "blob.xyz"
+        ctrl.write_bytes(b"ab\x01\x02\x03\x04cd\x10\x11\x12\x13\x14\x15\x16\x17")
+        assert analyze_file(text).transfer_hint == "text"
+        assert analyze_file(ctrl).transfer_hint == "binary"
+
+    def test_analyze_files_keeps_order(self, tmp_path: Path) -> None:
+        paths = [_write(tmp_path, f"f{i}.txt", f"file {i}\n") for i in range(10)]
+        paths.insert(3, tmp_path / "missing.txt")
+        infos = analyze_files(paths, max_workers=4)
+        assert [i.path for i in infos] == paths
+        assert infos[3].error == "File not found"
+        assert infos[0].digest == analyze_file(paths[0]).digest
+
+    def test_sha256_large_file(self, tmp_path: Path) -> None:
+        data = os.urandom(5 * 1024 * 1024 + 3)
+        p = tmp_path / "weights.bin"
+        p.write_bytes(data)
+        assert analyze_file(p).digest == hashlib.sha256(data).hexdigest()
+
+    def test_sha256_reused_until_file_changes(self, tmp_path: Path) -> None:
+        p = _write(tmp_path, "a.txt", "one\n")
+        cache: dict = {}
+        first = analyze_file(p, cache=cache).digest
+        assert list(cache.values()) == [first]
+        cache[next(iter(cache))] = "cached"
+        assert analyze_file(p, cache=cache).digest == "cached"
+        p.write_text("changed\n")
+        assert analyze_file(p, cache=cache).digest == hashlib.sha256(b"changed\n").hexdigest()
+
+    def test_blake2b_digest(self, tmp_path: Path) -> None:
+        data = os.urandom(5 * 1024 * 1024)
+        p = tmp_path / "model.gguf"
+        p.write_bytes(data)
+        info = analyze_file(p, algo="blake2b")
+        assert info.hash_algo == "blake2b"
+        assert info.digest == hashlib.blake2b(data).hexdigest()
+        assert "sha256" not in FileConverter().get_remote_metadata(info)
+        assert FileConverter().get_remote_metadata(analyze_file(p))["sha256"] == \
+            hashlib.sha256(data).hexdigest()
+        with pytest.raises(ValueError):
+            analyze_file(p, algo="md5")
+
+    def test_scandir_entries(self, tmp_path: Path) -> None:
+        p = _write(tmp_path, "notes.txt", "hello")
+        (tmp_path / "sub").mkdir()
+        with os.scandir(tmp_path) as it:
+            infos = {i.name: i for i in analyze_files(list(it))}
+        assert infos["notes.txt"].path == p
+        assert infos["notes.txt"].digest == analyze_file(p).digest
+        assert infos["sub"].error == "Not a regular file"
+
+    def test_directory_is_not_regular_file(self, tmp_path: Path) -> None:
+        info = analyze_file(tmp_path)
+        assert not info.is_readable
+        assert info.error == "Not a regular file"
+
 
 # ---------------------------------------------------------------------------
 # FileConverter — name and needs_conversion
@@ -221,6 +289,19 @@ class TestCrlfStripping:
             if is_temp:
                 prepared_path.unlink(missing_ok=True)
 
+    def test_stale_crlf_flag_skips_copy(self, tmp_path: Path) -> None:
+        p = _write(tmp_path, "notes.txt", "one\ntwo\n", crlf=True)
+        info = analyze_file(p)
+        p.write_bytes(b"one\ntwo\n")
+        assert FileConverter().prepare(info) == (p, "notes.txt", False)
+
+    def test_crlf_split_across_chunks(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setattr(file_converter, "_CRLF_CHUNK", 4)
+        p = tmp_path / "notes.txt"
+        p.write_bytes(b"abc\r\ndef\r\r\nxyz\r")
+        out, _ = FileConverter().prepare_to_dir(analyze_file(p), tmp_path / "out")
+        assert out.read_bytes() == b"abc\ndef\r\nxyz\r"
+
 
 # ---------------------------------------------------------------------------
 # TransferSession
@@ -279,3 +360,27 @@ class TestPrepareToDir:
         out.mkdir()
         prepared, dgx_name = FileConverter().prepare_to_dir(info, out)
         assert prepared.read_bytes() == raw
+
+    def test_prepare_many_keeps_order(self, tmp_path: Path) -> None:
+        srcs = [
+            _write(tmp_path, "build.bat", "ECHO hi\n"),
+            _write(tmp_path, "notes.txt", "a\nb\n", crlf=True),
+            _write(tmp_path, "readme.txt", "plain\n"),
+        ]
+        out = tmp_path / "bridge"
+        results = FileConverter().prepare_many([analyze_file(p) for p in srcs], out)
+        assert [name for _, name in results] == ["build.sh", "notes.txt", "readme.txt"]
+        assert results[1][0].read_bytes() == b"a\nb\n"
+        assert results[2][0] == srcs[2]
+
+    def test_prepare_many_duplicate_names(self, tmp_path: Path) -> None:
+        srcs = []
+        for i in range(6):
+            d = tmp_path / f"src{i}"
+            d.mkdir()
+            srcs.append(_write(d, "notes.txt", f"copy {i}\n" * 50000, crlf=True))
+        out = tmp_path / "bridge"
+        results = FileConverter().prepare_many(
+            [analyze_file(p) for p in srcs], out, workers=6)
+        assert {path for path, _ in results} == {out / "notes.txt"}
+        assert (out / "notes.txt").read_bytes() == b"copy 5\n" * 50000